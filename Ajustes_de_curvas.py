@@ -1,5 +1,8 @@
+import functools
+from collections import deque
+from math import comb
+
 import numpy as np
-import matplotlib.pyplot as plt
 from numpy.linalg import LinAlgError
 
 # -------------------------------------------------------------------
@@ -99,6 +102,102 @@ def calcular_regressao_linear_manual(x, y):
             
     return polinomio, B0, B1, R_quadrado, variancia_residuos, desvio_padrao_residuos, None
 
+class AcumuladorRegressaoLinear:
+    """
+    Regressão linear (quadrados mínimos) em fluxo, com memória O(1).
+
+    Mantém n, as médias de x e y e os co-momentos SS_xx, SS_yy e SS_xy,
+    atualizados no estilo de Welford a cada ponto ou bloco de pontos
+    (adicionar). Acumuladores calculados em partes diferentes dos dados
+    (outros processos, outros arquivos) podem ser combinados exatamente com
+    mesclar. resultado() devolve os mesmos campos que
+    calcular_regressao_linear_manual, com B0, B1 e R² iguais a menos de
+    arredondamento. Sem os resíduos em mãos, porém, SQE sai de
+    SS_yy - B1·SS_xy, que perde dígitos por cancelamento quando R² ≈ 1: a
+    variância e o desvio padrão dos resíduos ficam imprecisos nesse caso
+    (com resíduos ~1e-8 da escala de y podem perder todos os dígitos e sair 0).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.SS_xx = 0.0
+        self.SS_yy = 0.0
+        self.SS_xy = 0.0
+
+    def _combinar(self, n, media_x, media_y, SS_xx, SS_yy, SS_xy):
+        """Fórmula de Chan et al. para unir as estatísticas de dois conjuntos"""
+        if n == 0:
+            return self
+        total = self.n + n
+        delta_x = media_x - self.media_x
+        delta_y = media_y - self.media_y
+        peso = self.n * n / total
+        self.media_x += delta_x * n / total
+        self.media_y += delta_y * n / total
+        self.SS_xx += SS_xx + delta_x * delta_x * peso
+        self.SS_yy += SS_yy + delta_y * delta_y * peso
+        self.SS_xy += SS_xy + delta_x * delta_y * peso
+        self.n = total
+        return self
+
+    def adicionar(self, x, y):
+        """Acrescenta um ponto ou um bloco de pontos (arrays x e y)"""
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        if len(x) != len(y):
+            raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+        if len(x) == 0:
+            return self
+        media_x, media_y = np.mean(x), np.mean(y)
+        dx, dy = x - media_x, y - media_y
+        return self._combinar(len(x), media_x, media_y,
+                              np.dot(dx, dx), np.dot(dy, dy), np.dot(dx, dy))
+
+    def mesclar(self, outro):
+        """Incorpora as estatísticas de outro acumulador (resultado exato)"""
+        return self._combinar(outro.n, outro.media_x, outro.media_y,
+                              outro.SS_xx, outro.SS_yy, outro.SS_xy)
+
+    def resultado(self):
+        """
+        Retorna (polinomio, B0, B1, R_quadrado, variancia_residuos,
+        desvio_padrao_residuos, erro_msg), como calcular_regressao_linear_manual
+        (ver na classe o limite de precisão de SQE quando R² ≈ 1).
+        """
+        if self.n < 2:
+            return None, 0, 0, 0, np.nan, np.nan, "Erro: Você precisa de pelo menos 2 pontos."
+        if self.SS_xx < 1e-10:
+            return None, 0, 0, 0, np.nan, np.nan, "Erro: Todos os valores de x são idênticos."
+
+        B1 = self.SS_xy / self.SS_xx
+        B0 = self.media_y - B1 * self.media_x
+        polinomio = np.poly1d([B1, B0])
+
+        SQT = self.SS_yy
+        SQE = max(SQT - B1 * self.SS_xy, 0.0)
+
+        R_quadrado = 0.0
+        if SQT > 1e-10:
+            R_quadrado = 1 - (SQE / SQT)
+        elif SQE < 1e-10:
+            R_quadrado = 1.0
+
+        df = self.n - 2
+
+        variancia_residuos = np.nan
+        desvio_padrao_residuos = np.nan
+
+        if df > 0:
+            variancia_residuos = SQE / df
+            desvio_padrao_residuos = np.sqrt(variancia_residuos)
+        elif SQE < 1e-10:
+            variancia_residuos = 0.0
+            desvio_padrao_residuos = 0.0
+
+        return polinomio, B0, B1, R_quadrado, variancia_residuos, desvio_padrao_residuos, None
+
 def calcular_interpolacao_linear_manual(x0, y0, x1, y1):
     """
     CÁLCULO MANUAL (OPÇÃO 4): Interpolação Linear (Fórmula P1(x))
@@ -120,50 +219,620 @@ def calcular_polinomio_com_polyfit(x, y, grau):
         print(f"\nErro ao calcular o polinômio: {e}")
         return None
 
+@functools.lru_cache(maxsize=16)
+def _fatoracao_QR_polinomial(x_bytes, grau):
+    """
+    Fatora (QR) a matriz de projeto de grau `grau` sobre a malha x, com as
+    colunas normalizadas como em np.polyfit. Retorna (Q, S), em que
+    S = R^-1 Qᵀ (já desfeita a normalização) leva Y direto aos coeficientes.
+    Fica em cache por (x, grau).
+    """
+    x = np.frombuffer(x_bytes, dtype=float)
+    V = np.vander(x, grau + 1)
+    escala = np.sqrt(np.sum(V * V, axis=0))
+    escala[escala == 0] = 1.0
+    Q, R = np.linalg.qr(V / escala)
+    diagonal = np.abs(np.diagonal(R))
+    if np.any(diagonal <= diagonal.max() * len(x) * np.finfo(float).eps):
+        raise LinAlgError("Matriz de projeto com posto incompleto: grau alto demais para estes x.")
+    S = np.linalg.solve(R, Q.T) / escala[:, None]
+    Q.flags.writeable = False
+    S.flags.writeable = False
+    return Q, S
+
+def calcular_polinomios_em_lote(x, Y, grau):
+    """
+    Regressão polinomial de grau `grau` para várias séries que compartilham
+    a mesma malha x. Y tem forma (n,) ou (n, k), uma série por coluna.
+
+    A matriz de projeto é fatorada (QR) uma única vez por (x, grau) e fica em
+    cache; cada novo lote custa apenas produtos matriciais. Retorna
+    (coeficientes, SQE, R_quadrado): coeficientes tem forma (grau + 1, k), do
+    maior para o menor grau como em np.polyfit/np.poly1d; SQE e R_quadrado
+    têm uma entrada por série.
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    uma_serie = Y.ndim == 1
+    if uma_serie:
+        Y = Y[:, None]
+    if Y.shape[0] != len(x):
+        raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+    if grau >= len(x):
+        raise ValueError(f"O grau {grau} é muito alto para {len(x)} pontos.")
+
+    Q, S = _fatoracao_QR_polinomial(x.tobytes(), grau)
+    coeficientes = S @ Y
+    residuos = Y - Q @ (Q.T @ Y)
+    SQE = np.sum(residuos**2, axis=0)
+    SQT = np.sum((Y - Y.mean(axis=0))**2, axis=0)
+
+    R_quadrado = np.zeros_like(SQT)
+    variavel = SQT > 1e-10
+    R_quadrado[variavel] = 1 - SQE[variavel] / SQT[variavel]
+    R_quadrado[~variavel & (SQE < 1e-10)] = 1.0
+
+    if uma_serie:
+        return coeficientes[:, 0], SQE[0], R_quadrado[0]
+    return coeficientes, SQE, R_quadrado
+
+def _avaliar_base_ortogonal(t, alfas, betas):
+    """Avalia q_0, ..., q_m em t pela mesma recorrência de três termos (matriz n x (m+1))"""
+    m = len(alfas)
+    base = np.empty((len(t), m + 1))
+    base[:, 0] = 1.0 / betas[0]
+    anterior = np.zeros_like(t)
+    for j in range(m):
+        proximo = (t - alfas[j]) * base[:, j] - betas[j] * anterior
+        anterior = base[:, j]
+        base[:, j + 1] = proximo / betas[j + 1]
+    return base
+
+def ajuste_polinomial_ortogonal(x, y, grau_max):
+    """
+    Ajusta de uma só vez os polinômios de quadrados mínimos de grau 0 a
+    grau_max usando polinômios ortogonais discretos sobre x (recorrência de
+    três termos de Forsythe, na versão ortonormal), em O(n·grau_max).
+
+    Retorna um dicionário com a mudança de variável t = (x - centro)/escala,
+    os parâmetros da recorrência (alfas, betas), os coeficientes c_j na base
+    ortonormal e SQE[m], a soma dos quadrados dos resíduos do ajuste de grau m.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if grau_max >= n:
+        raise ValueError(f"O grau {grau_max} é muito alto para {n} pontos.")
+    centro = np.mean(x)
+    escala = np.max(np.abs(x - centro)) or 1.0
+    t = (x - centro) / escala
+
+    alfas, betas = [], [np.sqrt(n)]
+    q_atual = np.full(n, 1.0 / betas[0])
+    q_anterior = np.zeros(n)
+    residuo = y.copy()
+    coeficientes, SQE = [], []
+    for j in range(grau_max + 1):
+        c = residuo @ q_atual  # Gram-Schmidt modificado: projeta o resíduo, não y
+        residuo -= c * q_atual
+        coeficientes.append(c)
+        SQE.append(residuo @ residuo)
+        if j == grau_max:
+            break
+        alfa = (t * q_atual) @ q_atual
+        v = (t - alfa) * q_atual - betas[j] * q_anterior
+        beta = np.sqrt(v @ v)
+        if beta == 0:
+            raise ValueError(f"x tem menos de {grau_max + 1} valores distintos.")
+        alfas.append(alfa)
+        betas.append(beta)
+        q_anterior, q_atual = q_atual, v / beta
+
+    return {"centro": centro, "escala": escala, "alfas": np.array(alfas),
+            "betas": np.array(betas), "coeficientes": np.array(coeficientes),
+            "SQE": np.array(SQE)}
+
+def _polinomio_do_ajuste_ortogonal(ajuste, grau):
+    """Converte o ajuste de grau `grau` da base ortonormal para np.poly1d em x"""
+    alfas, betas, c = ajuste["alfas"], ajuste["betas"], ajuste["coeficientes"]
+    q_anterior = np.poly1d([0.0])
+    q_atual = np.poly1d([1.0 / betas[0]])
+    polinomio_t = q_atual * c[0]
+    for j in range(grau):
+        proximo = (np.poly1d([1.0, -alfas[j]]) * q_atual - q_anterior * betas[j]) / betas[j + 1]
+        q_anterior, q_atual = q_atual, proximo
+        polinomio_t = polinomio_t + q_atual * c[j + 1]
+    # t = (x - centro) / escala
+    return polinomio_t(np.poly1d([1.0 / ajuste["escala"], -ajuste["centro"] / ajuste["escala"]]))
+
+def escolher_grau_polinomio(x, y, grau_max=None, criterio="bic", k_folds=5, semente=0):
+    """
+    Escolhe automaticamente o grau da regressão polinomial.
+
+    Os ajustes de todos os graus (0 a grau_max) saem de uma única passada
+    de ajuste_polinomial_ortogonal. criterio="aic" ou "bic" usa
+        n ln(SQE/n) + 2k   ou   n ln(SQE/n) + k ln(n),  k = grau + 1,
+    e criterio="cv" usa validação cruzada com k_folds partes (erro
+    quadrático médio de teste). Retorna (grau, polinomio, pontuacoes), com
+    polinomio do tipo np.poly1d e pontuacoes[m] a pontuação do grau m
+    (menor é melhor).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if grau_max is None:
+        grau_max = min(10, n - 2)
+    grau_max = max(0, min(grau_max, n - 1))
+    ajuste = ajuste_polinomial_ortogonal(x, y, grau_max)
+    k = np.arange(grau_max + 1) + 1
+
+    if criterio in ("aic", "bic"):
+        SQE = np.maximum(ajuste["SQE"], np.finfo(float).tiny)
+        penalidade = 2 * k if criterio == "aic" else k * np.log(n)
+        pontuacoes = n * np.log(SQE / n) + penalidade
+    elif criterio == "cv":
+        partes = np.array_split(np.random.default_rng(semente).permutation(n), min(k_folds, n))
+        erros = np.zeros(grau_max + 1)
+        for teste in partes:
+            treino = np.setdiff1d(np.arange(n), teste)
+            grau_parte = min(grau_max, len(treino) - 1)
+            parcial = ajuste_polinomial_ortogonal(x[treino], y[treino], grau_parte)
+            t = (x[teste] - parcial["centro"]) / parcial["escala"]
+            base = _avaliar_base_ortogonal(t, parcial["alfas"], parcial["betas"])
+            previsoes = np.cumsum(base * parcial["coeficientes"], axis=1)
+            erros[:grau_parte + 1] += np.sum((y[teste, None] - previsoes)**2, axis=0)
+            erros[grau_parte + 1:] = np.inf
+        pontuacoes = erros / n
+    else:
+        raise ValueError(f"Critério desconhecido: {criterio}")
+
+    grau = int(np.argmin(pontuacoes))
+    return grau, _polinomio_do_ajuste_ortogonal(ajuste, grau), pontuacoes
+
+def _deslocar_somas(S, Sy, Syy, n, d, dy):
+    """
+    Leva somas de potências em u = x - a, v = y - b para u' = u - d, v' = v - dy:
+    S[k] = Σ u^k, Sy[k] = Σ v·u^k, Syy = Σ v². Operam na última dimensão.
+    """
+    S_novo = np.zeros_like(S)
+    Sy_novo = np.zeros_like(Sy)
+    for k in range(S.shape[-1]):
+        for j in range(k + 1):
+            fator = comb(k, j) * (-d)**(k - j)
+            S_novo[..., k] += fator * S[..., j]
+            if k < Sy.shape[-1]:
+                Sy_novo[..., k] += fator * Sy[..., j]
+    Sy_novo -= dy[..., None] * S_novo[..., :Sy.shape[-1]]
+    Syy_novo = Syy - 2 * dy * Sy[..., 0] + dy * dy * n
+    return S_novo, Sy_novo, Syy_novo
+
+def _centrar_somas(S, Sy, Syy, n, centro, meia_largura):
+    """
+    Passa as somas de potências em u para a base t = (u - centro)/meia_largura,
+    centrada no meio da janela e com t em [-1, 1]: é nela que as equações
+    normais de grau alto continuam bem condicionadas.
+    """
+    centro = np.asarray(centro, dtype=float)
+    S, Sy, Syy = _deslocar_somas(S, Sy, Syy, n, centro, np.zeros_like(centro))
+    fatores = np.asarray(meia_largura, dtype=float)[..., None] ** -np.arange(S.shape[-1])
+    return S * fatores, Sy * fatores[..., :Sy.shape[-1]], Syy
+
+def _resolver_equacoes_normais(S, Sy, Syy, n, grau):
+    """
+    Resolve, janela a janela (dimensões iniciais), as equações normais
+    G β = Sy com G[a, b] = S[a + b], com as somas já na base centrada
+    (ver _centrar_somas). Retorna (beta, SQE, SQT); janelas com x
+    insuficientes para o grau (G numericamente singular) recebem NaN.
+    """
+    indices = np.add.outer(np.arange(grau + 1), np.arange(grau + 1))
+    G = S[..., indices]
+    # Posto pelo condicionamento de G com diagonal unitária: menor autovalor
+    # comparável ao erro de arredondamento das somas (n·eps·maior autovalor)
+    diagonal = np.sqrt(np.diagonal(G, axis1=-2, axis2=-1))
+    diagonal = np.where(diagonal > 0, diagonal, 1.0)
+    G_normalizada = G / diagonal[..., :, None] / diagonal[..., None, :]
+    autovalores = np.linalg.eigvalsh(G_normalizada)
+    singular = ~(autovalores[..., 0] > n * np.finfo(float).eps * autovalores[..., -1])
+    G_normalizada = np.where(singular[..., None, None], np.eye(grau + 1), G_normalizada)
+    beta = np.linalg.solve(G_normalizada, (Sy / diagonal)[..., None])[..., 0] / diagonal
+    beta[singular] = np.nan
+
+    SQE = np.maximum(Syy - np.sum(beta * Sy, axis=-1), 0.0)
+    SQT = np.maximum(Syy - Sy[..., 0]**2 / n, 0.0)
+    return beta, SQE, SQT
+
+def _R_quadrado(SQE, SQT):
+    """R² com as mesmas convenções de calcular_regressao_linear_manual"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(SQT > 1e-10, 1 - SQE / SQT,
+                        np.where(SQE < 1e-10, 1.0, 0.0))
+
+def _coeficientes_em_x(beta, x_ref, escala, y_ref):
+    """
+    Converte β (potências de u = (x - x_ref)/escala, do menor grau para o
+    maior) em coeficientes de x, do maior para o menor grau como em np.poly1d.
+    """
+    grau = beta.shape[-1] - 1
+    coeficientes = np.zeros_like(beta)
+    for k in range(grau + 1):
+        for j in range(k + 1):
+            coeficientes[..., grau - j] += (beta[..., k] * comb(k, j)
+                                            * (-x_ref)**(k - j) / escala**k)
+    coeficientes[..., grau] += y_ref
+    return coeficientes
+
+def regressao_janela_movel(x, y, janela, grau=1):
+    """
+    Regressão polinomial (quadrados mínimos) de grau `grau` em todas as
+    janelas deslizantes de `janela` pontos de uma série, numa única passada
+    vetorizada em O(n·grau²), em vez de O(n·janela) refazendo cada janela.
+
+    As somas das equações normais saem de somas acumuladas reiniciadas a
+    cada `janela` pontos, cada bloco medido a partir do seu primeiro ponto;
+    a parte de uma janela que cai no bloco anterior é trazida para a
+    referência do bloco atual (binômio de Newton). Assim as somas nunca
+    crescem com o comprimento da série nem com o deslocamento de x. Antes de
+    resolver, as somas de cada janela passam para a base centrada no meio da
+    janela e escalada pela meia largura, e janelas com x insuficientes para o
+    grau são detectadas pelo condicionamento das equações normais.
+
+    Retorna (coeficientes, R_quadrado): coeficientes tem forma (n, grau + 1),
+    do maior para o menor grau como em np.poly1d, e a linha i corresponde à
+    janela que termina no ponto i. As primeiras janela - 1 linhas são NaN.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if len(y) != n:
+        raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+    if grau < 0 or janela <= grau:
+        raise ValueError(f"A janela de {janela} pontos é pequena demais para o grau {grau}.")
+    coeficientes = np.full((n, grau + 1), np.nan)
+    R_quadrado = np.full(n, np.nan)
+    if n < janela:
+        return coeficientes, R_quadrado
+
+    # Blocos de `janela` pontos, cada um com a própria referência (x, y)
+    n_blocos = -(-n // janela)
+    bloco = np.arange(n) // janela
+    x_ref = x[bloco * janela]
+    y_ref = y[bloco * janela]
+    escala = np.max(np.abs(x - x_ref)) or 1.0
+    u = (x - x_ref) / escala
+    v = y - y_ref
+
+    potencias = u[:, None] ** np.arange(2 * grau + 1)
+    termos = np.concatenate([potencias, v[:, None] * potencias[:, :grau + 1],
+                             (v * v)[:, None]], axis=1)
+    preenchido = np.zeros((n_blocos * janela, termos.shape[1]))
+    preenchido[:n] = termos
+    por_bloco = preenchido.reshape(n_blocos, janela, -1)
+    prefixo = np.cumsum(por_bloco, axis=1).reshape(-1, termos.shape[1])[:n]
+    sufixo = np.cumsum(por_bloco[:, ::-1], axis=1)[:, ::-1].reshape(-1, termos.shape[1])[:n]
+
+    fim = np.arange(janela - 1, n)
+    inicio = fim - janela + 1
+    somas = prefixo[fim]
+    atravessa = inicio % janela != 0
+    cauda = np.where(atravessa[:, None], sufixo[inicio], 0.0)
+    n_cauda = np.where(atravessa, janela - inicio % janela, 0)
+    d = np.where(atravessa, (x_ref[fim] - x_ref[inicio]) / escala, 0.0)
+    dy = np.where(atravessa, y_ref[fim] - y_ref[inicio], 0.0)
+    S_c, Sy_c, Syy_c = _deslocar_somas(cauda[:, :2 * grau + 1],
+                                       cauda[:, 2 * grau + 1:-1], cauda[:, -1],
+                                       n_cauda, d, dy)
+    S = somas[:, :2 * grau + 1] + S_c
+    Sy = somas[:, 2 * grau + 1:-1] + Sy_c
+    Syy = somas[:, -1] + Syy_c
+
+    # Base de cada janela: centrada no meio e escalada pela meia largura
+    centro = (x[inicio] + x[fim]) / 2
+    meia_largura = np.abs(x[fim] - x[inicio]) / 2
+    meia_largura[meia_largura == 0] = escala
+    S, Sy, Syy = _centrar_somas(S, Sy, Syy, janela, (centro - x_ref[fim]) / escala,
+                                meia_largura / escala)
+    beta, SQE, SQT = _resolver_equacoes_normais(S, Sy, Syy, janela, grau)
+    coeficientes[fim] = _coeficientes_em_x(beta, centro, meia_largura, y_ref[fim])
+    R_quadrado[fim] = _R_quadrado(SQE, SQT)
+    return coeficientes, R_quadrado
+
+def regressao_linear_janela_movel(x, y, janela):
+    """
+    Regressão linear em todas as janelas deslizantes (ver
+    regressao_janela_movel). Retorna os arrays (inclinacao, intercepto,
+    R_quadrado), alinhados com a série: a posição i corresponde à janela
+    que termina no ponto i, e as primeiras janela - 1 posições são NaN.
+    """
+    coeficientes, R_quadrado = regressao_janela_movel(x, y, janela, grau=1)
+    return coeficientes[:, 0], coeficientes[:, 1], R_quadrado
+
+class RegressaoJanelaMovel:
+    """
+    Regressão polinomial em janela deslizante para dados que chegam em fluxo.
+
+    Cada ponto que entra (e o que sai, quando a janela está cheia) atualiza
+    as somas das equações normais em O(grau). A cada `reinicio` atualizações
+    (padrão: o tamanho da janela; enquanto a janela enche, sempre que o
+    número de pontos dobra) as somas são recalculadas do zero com referência
+    no ponto mais recente, o que descarta o erro de arredondamento acumulado
+    nas subtrações e mantém |u| ≲ 1 para os pontos que ainda vão chegar; o
+    custo amortizado continua O(1) por ponto.
+    """
+
+    def __init__(self, janela, grau=1, reinicio=None):
+        if grau < 0 or janela <= grau:
+            raise ValueError(f"A janela de {janela} pontos é pequena demais para o grau {grau}.")
+        self.janela = janela
+        self.grau = grau
+        self.reinicio = reinicio or janela
+        self.pontos = deque()
+        self._recalcular()
+
+    def _termos(self, x, y):
+        u = (x - self.x_ref) / self.escala
+        potencias = u ** np.arange(2 * self.grau + 1)
+        v = y - self.y_ref
+        return potencias, v * potencias[:self.grau + 1], v * v
+
+    def _recalcular(self):
+        """Reinício seguro: refaz as somas com referência no ponto mais recente"""
+        self.atualizacoes = 0
+        self.tamanho_no_reinicio = len(self.pontos)
+        self.x_ref, self.y_ref = self.pontos[-1] if self.pontos else (0.0, 0.0)
+        self.escala = max((abs(px - self.x_ref) for px, _ in self.pontos), default=0.0) or 1.0
+        self.S = np.zeros(2 * self.grau + 1)
+        self.Sy = np.zeros(self.grau + 1)
+        self.Syy = 0.0
+        for px, py in self.pontos:
+            potencias, ponderadas, quadrado = self._termos(px, py)
+            self.S += potencias
+            self.Sy += ponderadas
+            self.Syy += quadrado
+
+    def adicionar(self, x, y):
+        """Acrescenta um ponto, descartando o mais antigo se a janela estiver cheia"""
+        x, y = float(x), float(y)
+        if not self.pontos:
+            self.pontos.append((x, y))
+            self._recalcular()
+            return self
+        self.pontos.append((x, y))
+        potencias, ponderadas, quadrado = self._termos(x, y)
+        self.S += potencias
+        self.Sy += ponderadas
+        self.Syy += quadrado
+        if len(self.pontos) > self.janela:
+            potencias, ponderadas, quadrado = self._termos(*self.pontos.popleft())
+            self.S -= potencias
+            self.Sy -= ponderadas
+            self.Syy -= quadrado
+        self.atualizacoes += 1
+        if self.atualizacoes >= min(self.reinicio, self.tamanho_no_reinicio):
+            self._recalcular()
+        return self
+
+    def resultado(self):
+        """
+        Retorna (polinomio, R_quadrado) da janela atual, com polinomio do tipo
+        np.poly1d, ou (None, nan) se ainda não houver pontos suficientes.
+        """
+        if len(self.pontos) <= self.grau:
+            return None, np.nan
+        n = len(self.pontos)
+        primeiro, ultimo = self.pontos[0][0], self.pontos[-1][0]
+        centro = (primeiro + ultimo) / 2
+        meia_largura = abs(ultimo - primeiro) / 2 or self.escala
+        S, Sy, Syy = _centrar_somas(self.S, self.Sy, self.Syy, n,
+                                    (centro - self.x_ref) / self.escala,
+                                    meia_largura / self.escala)
+        beta, SQE, SQT = _resolver_equacoes_normais(S, Sy, Syy, n, self.grau)
+        if np.isnan(beta).any():
+            return None, np.nan
+        coeficientes = _coeficientes_em_x(beta, centro, meia_largura, self.y_ref)
+        return np.poly1d(coeficientes), float(_R_quadrado(SQE, SQT))
+
 # -------------------------------------------------------------------
 # FUNÇÕES DE PLOTAGEM (MODIFICADO)
 # -------------------------------------------------------------------
 
-def plotar_dispersao(x, y):
+def reduzir_lttb(x, y, n_saida):
+    """
+    Largest-Triangle-Three-Buckets: escolhe n_saida índices de uma série com
+    x crescente que preservam a forma visual de y(x). Divide os pontos
+    internos em n_saida - 2 baldes e, em cada um, fica com o ponto que forma
+    o maior triângulo com o último escolhido e a média do balde seguinte.
+    """
+    n = len(x)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+    limites = np.linspace(1, n - 1, n_saida - 1).astype(int)
+    # Médias de cada balde; o "balde seguinte" do último é o ponto final
+    medias_x = np.append(np.add.reduceat(x[1:n - 1], limites[:-1] - 1) / np.diff(limites), x[-1])
+    medias_y = np.append(np.add.reduceat(y[1:n - 1], limites[:-1] - 1) / np.diff(limites), y[-1])
+
+    indices = np.empty(n_saida, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    escolhido = 0
+    for i in range(n_saida - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        ax, ay = x[escolhido], y[escolhido]
+        area = np.abs((ax - medias_x[i + 1]) * (y[inicio:fim] - ay)
+                      - (ax - x[inicio:fim]) * (medias_y[i + 1] - ay))
+        escolhido = inicio + int(np.argmax(area))
+        indices[i + 1] = escolhido
+    return indices
+
+def reduzir_min_max(y, n_baldes):
+    """
+    Divide a série em n_baldes baldes consecutivos e fica com os índices do
+    mínimo e do máximo de cada um (mais o primeiro e o último ponto):
+    o envelope desenhado é idêntico ao original com uma coluna por balde.
+    """
+    n = len(y)
+    if 2 * n_baldes + 2 >= n:
+        return np.arange(n)
+    tamanho = -(-n // n_baldes)
+    preenchido = np.concatenate([y, np.full(tamanho * n_baldes - n, y[-1])]).reshape(n_baldes, tamanho)
+    inicio = np.arange(n_baldes) * tamanho
+    indices = np.concatenate([[0, n - 1],
+                              inicio + np.argmin(preenchido, axis=1),
+                              inicio + np.argmax(preenchido, axis=1)])
+    return np.unique(np.minimum(indices, n - 1))
+
+def _reduzir_para_desenho(x, y, max_pontos, metodo):
+    """
+    Reduz (x, y) a no máximo cerca de max_pontos pontos, ordenando por x
+    se preciso. metodo: "lttb", "min_max" ou None (sem redução).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if metodo is None or len(x) <= max_pontos:
+        return x, y
+    if np.any(np.diff(x) < 0):
+        ordem = np.argsort(x, kind="stable")
+        x, y = x[ordem], y[ordem]
+    if metodo == "lttb":
+        indices = reduzir_lttb(x, y, max_pontos)
+    elif metodo == "min_max":
+        indices = reduzir_min_max(y, max_pontos // 2)
+    else:
+        raise ValueError(f"Método de redução desconhecido: {metodo}")
+    return x[indices], y[indices]
+
+def amostrar_curva(f, a, b, tolerancia_y, max_pontos=4096, n_inicial=64):
+    """
+    Amostra y = f(x) em [a, b] com resolução adaptada à visualização:
+    parte de n_inicial pontos e subdivide apenas os segmentos cujo ponto
+    médio se afasta da reta entre as pontas mais que tolerancia_y
+    (tipicamente meio pixel na vertical). f deve aceitar arrays.
+    """
+    xs = np.linspace(a, b, n_inicial)
+    ys = f(xs)
+    while len(xs) < max_pontos:
+        meio = (xs[:-1] + xs[1:]) / 2
+        y_meio = f(meio)
+        refinar = np.flatnonzero(np.abs(y_meio - (ys[:-1] + ys[1:]) / 2) > tolerancia_y)
+        if len(refinar) == 0:
+            break
+        refinar = refinar[:max_pontos - len(xs)]
+        xs = np.insert(xs, refinar + 1, meio[refinar])
+        ys = np.insert(ys, refinar + 1, y_meio[refinar])
+    return xs, ys
+
+def _criar_figura(arquivo, dpi):
+    """
+    Sem arquivo, usa o pyplot (janela interativa). Com arquivo, monta a
+    figura direto no backend Agg, sem estado global nem interface gráfica,
+    o que funciona em servidores e em processos paralelos.
+    """
+    if arquivo is None:
+        import matplotlib.pyplot as plt
+        figura = plt.figure(figsize=(10, 6), dpi=dpi)
+    else:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figura = Figure(figsize=(10, 6), dpi=dpi)
+        FigureCanvasAgg(figura)
+    return figura, figura.add_subplot()
+
+def _finalizar_figura(figura, eixos, titulo, arquivo, mensagem):
+    """Rótulos comuns; depois exibe (pyplot) ou salva (PNG, SVG... pela extensão)"""
+    eixos.set_title(titulo)
+    eixos.set_xlabel('Eixo X')
+    eixos.set_ylabel('Eixo Y')
+    eixos.legend()
+    eixos.grid(True, linestyle='--', alpha=0.6)
+
+    if arquivo is None:
+        import matplotlib.pyplot as plt
+        print(mensagem)
+        plt.show()
+    else:
+        figura.savefig(arquivo)
+    return arquivo
+
+def _desenhar_pontos(eixos, x, y, max_pontos, metodo):
+    """Dispersão dos pontos, reduzida quando há mais pontos que pixels"""
+    x_desenho, y_desenho = _reduzir_para_desenho(x, y, max_pontos, metodo)
+    rotulo = 'Pontos Originais'
+    if len(x_desenho) < len(x):
+        rotulo += f' ({len(x_desenho)} de {len(x)})'
+    eixos.scatter(x_desenho, y_desenho, color='red', label=rotulo, zorder=5)
+
+def plotar_dispersao(x, y, arquivo=None, max_pontos=None, metodo="lttb", dpi=100):
     """
     NOVA FUNÇÃO: Plota apenas o diagrama de dispersão (os pontos).
+
+    Com arquivo (ex.: "grafico.png" ou "grafico.svg") o gráfico é gerado
+    sem janela, pelo backend Agg. Se houver mais de max_pontos pontos
+    (padrão: 2 por coluna de pixel da figura) eles são reduzidos por LTTB
+    ou por mínimo/máximo por balde (metodo="min_max"); metodo=None desenha
+    todos.
     """
-    plt.figure(figsize=(10, 6))
-    plt.scatter(x, y, color='red', label='Pontos Originais', zorder=5)
-    plt.title("Diagrama de Dispersão (Apenas Pontos)")
-    plt.xlabel('Eixo X')
-    plt.ylabel('Eixo Y')
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.6)
-    
-    print("\nExibindo gráfico de dispersão...")
-    plt.show()
+    figura, eixos = _criar_figura(arquivo, dpi)
+    if max_pontos is None:
+        max_pontos = 2 * int(figura.get_figwidth() * dpi)
+    _desenhar_pontos(eixos, x, y, max_pontos, metodo)
+    return _finalizar_figura(figura, eixos, "Diagrama de Dispersão (Apenas Pontos)",
+                             arquivo, "\nExibindo gráfico de dispersão...")
 
-def plotar_grafico_completo(x, y, polinomio, titulo):
+def plotar_grafico_completo(x, y, polinomio, titulo, arquivo=None, max_pontos=None,
+                            metodo="lttb", dpi=100, rotulo_curva=None):
     """
     Plota os pontos originais E a curva do polinômio.
+
+    Os pontos são reduzidos como em plotar_dispersao, e a curva é amostrada
+    adaptativamente (amostrar_curva) com tolerância de meio pixel. polinomio
+    pode ser qualquer função vetorizada (ex.: uma spline); a legenda usa
+    rotulo_curva ou, se omitido, o grau (polinomio.order) quando existir.
     """
-    plt.figure(figsize=(10, 6))
-    plt.scatter(x, y, color='red', label='Pontos Originais', zorder=5)
+    figura, eixos = _criar_figura(arquivo, dpi)
+    if max_pontos is None:
+        max_pontos = 2 * int(figura.get_figwidth() * dpi)
+    _desenhar_pontos(eixos, x, y, max_pontos, metodo)
     
     x_min, x_max = np.min(x), np.max(x)
     espaco_extra = (x_max - x_min) * 0.1
     if espaco_extra < 0.5: espaco_extra = 0.5
-        
-    x_plot = np.linspace(x_min - espaco_extra, x_max + espaco_extra, 400)
-    
-    y_plot = polinomio(x_plot)
-    
-    plt.plot(x_plot, y_plot, label=f'Curva de Ajuste (Grau {polinomio.order})')
+
+    # Meio pixel na vertical, medido na faixa ocupada pelos pontos e pela curva
+    y_grosso = polinomio(np.linspace(x_min - espaco_extra, x_max + espaco_extra, 64))
+    faixa_y = max(np.max(y), np.max(y_grosso)) - min(np.min(y), np.min(y_grosso))
+    tolerancia_y = (faixa_y or 1.0) / (figura.get_figheight() * dpi) / 2
+    x_plot, y_plot = amostrar_curva(polinomio, x_min - espaco_extra, x_max + espaco_extra,
+                                    tolerancia_y, max_pontos=max_pontos)
     
-    plt.title(titulo)
-    plt.xlabel('Eixo X')
-    plt.ylabel('Eixo Y')
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.6)
+    if rotulo_curva is None:
+        grau = getattr(polinomio, "order", None)
+        rotulo_curva = 'Curva de Ajuste' if grau is None else f'Curva de Ajuste (Grau {grau})'
+    eixos.plot(x_plot, y_plot, label=rotulo_curva)
     
-    print("\nExibindo gráfico com curva de ajuste...")
-    plt.show()
+    return _finalizar_figura(figura, eixos, titulo, arquivo,
+                             "\nExibindo gráfico com curva de ajuste...")
+
+def _renderizar_tarefa(tarefa):
+    """Executa uma tarefa de renderizar_graficos (precisa ser global para o pickle)"""
+    if "polinomio" in tarefa:
+        return plotar_grafico_completo(**tarefa)
+    return plotar_dispersao(**tarefa)
+
+def renderizar_graficos(tarefas, processos=None):
+    """
+    Gera vários gráficos em arquivo, em paralelo. Cada tarefa é um dicionário
+    com os argumentos de plotar_grafico_completo (se tiver "polinomio") ou de
+    plotar_dispersao, incluindo obrigatoriamente "arquivo". processos=None
+    usa um processo por CPU; 1 renderiza tudo no processo atual.
+    Retorna a lista de arquivos gerados.
+    """
+    if any(tarefa.get("arquivo") is None for tarefa in tarefas):
+        raise ValueError("Toda tarefa de renderização precisa de um 'arquivo'.")
+    if processos == 1 or len(tarefas) <= 1:
+        return [_renderizar_tarefa(tarefa) for tarefa in tarefas]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(_renderizar_tarefa, tarefas))
 
 # -------------------------------------------------------------------
 # MENU PRINCIPAL (MODIFICADO)
@@ -241,17 +910,24 @@ def menu():
             x_para_plotar, y_para_plotar = x, y
             n_pontos = len(x)
             try:
-                grau_m = int(input(f"Digite o grau 'm' do polinômio (m < {n_pontos}): "))
-                if grau_m >= n_pontos:
-                    print(f"Erro: O grau {grau_m} é muito alto.")
-                    continue
-                if grau_m < 1:
-                     print("Erro: O grau deve ser pelo menos 1.")
-                     continue
-                     
-                print(f"\nCalculando Regressão Polinomial (Quadrados Mínimos, Grau {grau_m})...")
-                polinomio = calcular_polinomio_com_polyfit(x, y, grau_m)
-                titulo = f"Regressão Polinomial (Quadrados Mínimos, Grau {grau_m})"
+                entrada = input(f"Digite o grau 'm' do polinômio (m < {n_pontos}) ou 'a' para escolha automática: ").strip().lower()
+                if entrada == 'a':
+                    criterio = input("Critério (aic / bic / cv) [bic]: ").strip().lower() or "bic"
+                    grau_m, polinomio, _ = escolher_grau_polinomio(x, y, criterio=criterio)
+                    print(f"\nGrau escolhido pelo critério {criterio.upper()}: {grau_m}")
+                    titulo = f"Regressão Polinomial (Quadrados Mínimos, Grau {grau_m}, {criterio.upper()})"
+                else:
+                    grau_m = int(entrada)
+                    if grau_m >= n_pontos:
+                        print(f"Erro: O grau {grau_m} é muito alto.")
+                        continue
+                    if grau_m < 1:
+                         print("Erro: O grau deve ser pelo menos 1.")
+                         continue
+
+                    print(f"\nCalculando Regressão Polinomial (Quadrados Mínimos, Grau {grau_m})...")
+                    polinomio = calcular_polinomio_com_polyfit(x, y, grau_m)
+                    titulo = f"Regressão Polinomial (Quadrados Mínimos, Grau {grau_m})"
                 
                 if polinomio is not None:
                     print("\nPolinômio Encontrado:")
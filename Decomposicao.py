@@ -1,20 +1,42 @@
+import heapq
+import os
+
+try:
+    import numpy as np
+except ImportError:  # Os métodos em listas continuam funcionando sem NumPy
+    np = None
+
 def multiplicar_matriz_vetor(matriz, vetor):
-    """Multiplica uma matriz por um vetor"""
+    """
+    Multiplica uma matriz por um vetor.
+    Com NumPy disponível o produto é feito por BLAS; o resultado segue o tipo
+    da entrada (lista para listas, array para arrays).
+    """
     n = len(matriz)
     m = len(vetor)
     if len(matriz[0]) != m:
         raise ValueError("Número de colunas da matriz deve ser igual ao número de linhas do vetor.")
 
+    if np is not None:
+        resultado = np.asarray(matriz, dtype=float) @ np.asarray(vetor, dtype=float)
+        return resultado if isinstance(matriz, np.ndarray) else resultado.tolist()
+
     resultado = [0.0] * n
     for i in range(n):
+        linha = matriz[i]
         soma = 0.0
         for j in range(m):
-            soma += matriz[i][j] * vetor[j]
+            soma += linha[j] * vetor[j]
         resultado[i] = soma
     return resultado
 
-def multiplicar_matrizes(matriz1, matriz2):
-    """Multiplica duas matrizes"""
+def multiplicar_matrizes(matriz1, matriz2, tamanho_bloco=64):
+    """
+    Multiplica duas matrizes.
+    Com NumPy disponível o produto é feito por BLAS. Sem NumPy usa laços em
+    blocos (tamanho_bloco) na ordem i-k-j, que percorre as linhas de matriz2 e
+    do resultado de forma contígua.
+    """
     n1 = len(matriz1)
     m1 = len(matriz1[0])
     n2 = len(matriz2)
@@ -23,15 +45,36 @@ def multiplicar_matrizes(matriz1, matriz2):
     if m1 != n2:
         raise ValueError("Número de colunas da primeira matriz deve ser igual ao número de linhas da segunda.")
 
+    if np is not None:
+        resultado = np.asarray(matriz1, dtype=float) @ np.asarray(matriz2, dtype=float)
+        return resultado if isinstance(matriz1, np.ndarray) else resultado.tolist()
+
     resultado = [[0.0] * m2 for _ in range(n1)]
-    for i in range(n1):
-        for j in range(m2):
-            soma = 0.0
-            for k in range(m1):
-                soma += matriz1[i][k] * matriz2[k][j]
-            resultado[i][j] = soma
+    for k0 in range(0, m1, tamanho_bloco):
+        k1 = min(k0 + tamanho_bloco, m1)
+        for j0 in range(0, m2, tamanho_bloco):
+            j1 = min(j0 + tamanho_bloco, m2)
+            for i in range(n1):
+                linha_a = matriz1[i]
+                linha_r = resultado[i]
+                for k in range(k0, k1):
+                    a = linha_a[k]
+                    if a == 0:
+                        continue
+                    linha_b = matriz2[k]
+                    for j in range(j0, j1):
+                        linha_r[j] += a * linha_b[j]
     return resultado
 
+def aplicar_permutacao(perm, vetor):
+    """
+    Calcula P @ vetor em O(n) a partir do vetor de permutação perm
+    (linha i de P tem o 1 na coluna perm[i]), sem montar a matriz P.
+    """
+    if np is not None and isinstance(vetor, np.ndarray):
+        return vetor[np.asarray(perm)]
+    return [vetor[p] for p in perm]
+
 def gauss_sem_pivotacao(A, b):
     n = len(A)
     # Cria uma cópia da matriz aumentada para não modificar a original
@@ -58,7 +101,14 @@ def gauss_sem_pivotacao(A, b):
         x[i] = Ab[i][n] - soma
     return x
 
-def gauss_com_pivotacao(A, b):
+def gauss_com_pivotacao(A, b, motor="python"):
+    """
+    Eliminação de Gauss com pivotação parcial.
+    motor="numpy" usa a fatoração LU blocada (decomposicao_LU_blocada).
+    """
+    if motor == "numpy":
+        LU, perm = decomposicao_LU_blocada(A)
+        return _resolver_LU_compacto(LU, perm, b).tolist()
     n = len(A)
     Ab = [row + [b[i]] for i, row in enumerate(A)]
 
@@ -111,12 +161,24 @@ def decomposicao_LU(A):
                 L[k][i] = (A[k][i] - soma) / U[i][i]
     return L, U
 
-def decomposicao_LU_pivotacao(A):
-    """Decomposição LU com pivotação parcial (retorna P, L, U)"""
+def decomposicao_LU_pivotacao(A, motor="python", retornar_perm=False):
+    """
+    Decomposição LU com pivotação parcial (retorna P, L, U).
+    motor="numpy" usa a fatoração LU blocada (decomposicao_LU_blocada).
+    Com retornar_perm=True devolve (perm, L, U), com o vetor de permutação
+    no lugar da matriz P.
+    """
+    if motor == "numpy":
+        if retornar_perm:
+            LU, perm = decomposicao_LU_blocada(A)
+            _, L, U = expandir_PLU(LU, perm)
+            return perm.tolist(), L.tolist(), U.tolist()
+        P, L, U = decomposicao_LU_blocada(A, retornar_PLU=True)
+        return P.tolist(), L.tolist(), U.tolist()
     n = len(A)
     L = [[0.0] * n for _ in range(n)]
     U = [row[:] for row in A]
-    P = [[float(i == j) for j in range(n)] for i in range(n)]
+    perm = list(range(n))
 
     for i in range(n):
         max_row = max(range(i, n), key=lambda r: abs(U[r][i]))
@@ -124,7 +186,7 @@ def decomposicao_LU_pivotacao(A):
             raise ValueError("Matriz singular: não é possível decompor em LU.")
 
         U[i], U[max_row] = U[max_row], U[i]
-        P[i], P[max_row] = P[max_row], P[i]
+        perm[i], perm[max_row] = perm[max_row], perm[i]
         if i > 0:
             for j in range(i):
                 L[i][j], L[max_row][j] = L[max_row][j], L[i][j]
@@ -136,8 +198,84 @@ def decomposicao_LU_pivotacao(A):
 
         L[i][i] = 1.0
 
+    if retornar_perm:
+        return perm, L, U
+    P = [[float(perm[i] == j) for j in range(n)] for i in range(n)]
+    return P, L, U
+
+def decomposicao_LU_blocada(A, tamanho_bloco=64, retornar_PLU=False, dtype=float):
+    """
+    Decomposição LU com pivotação parcial em blocos (NumPy).
+
+    Fatora A no lugar em um único array compacto LU (L abaixo da diagonal,
+    com diagonal unitária implícita, e U na diagonal e acima) e um vetor de
+    permutação perm tal que A[perm] = L @ U. Cada painel de colunas é fatorado
+    com atualizações vetorizadas e o bloco restante é atualizado com um único
+    produto matricial (BLAS-3).
+
+    Com retornar_PLU=True retorna as matrizes P, L, U como em
+    decomposicao_LU_pivotacao. dtype=np.float32 fatora em precisão simples.
+    """
+    LU = np.array(A, dtype=dtype)
+    n = LU.shape[0]
+    if LU.ndim != 2 or LU.shape[1] != n:
+        raise ValueError("A matriz deve ser quadrada.")
+    perm = np.arange(n)
+
+    for k0 in range(0, n, tamanho_bloco):
+        k1 = min(k0 + tamanho_bloco, n)
+
+        # Fatoração do painel de colunas k0:k1
+        for j in range(k0, k1):
+            p = j + int(np.argmax(np.abs(LU[j:, j])))
+            if LU[p, j] == 0:
+                raise ValueError("Matriz singular: não é possível decompor em LU.")
+            if p != j:
+                LU[[j, p]] = LU[[p, j]]
+                perm[[j, p]] = perm[[p, j]]
+            LU[j + 1:, j] /= LU[j, j]
+            LU[j + 1:, j + 1:k1] -= np.outer(LU[j + 1:, j], LU[j, j + 1:k1])
+
+        if k1 < n:
+            # Linhas de U do bloco: U12 = L11^-1 * A12
+            for j in range(k0, k1):
+                LU[j + 1:k1, k1:] -= np.outer(LU[j + 1:k1, j], LU[j, k1:])
+            # Atualização do bloco restante: A22 -= L21 * U12
+            LU[k1:, k1:] -= LU[k1:, k0:k1] @ LU[k0:k1, k1:]
+
+    if retornar_PLU:
+        return expandir_PLU(LU, perm)
+    return LU, perm
+
+def expandir_PLU(LU, perm):
+    """Reconstrói as matrizes P, L, U a partir da forma compacta (LU, perm)"""
+    n = LU.shape[0]
+    P = np.zeros((n, n))
+    P[np.arange(n), perm] = 1.0
+    L = np.tril(LU, -1) + np.eye(n)
+    U = np.triu(LU)
     return P, L, U
 
+def _substituicao_direta_compacta(LU, perm, b):
+    """Resolve Ly = b[perm] (L unitária, guardada abaixo da diagonal de LU)"""
+    y = np.array(b, dtype=LU.dtype)[perm]
+    for i in range(LU.shape[0]):
+        y[i] -= LU[i, :i] @ y[:i]
+    return y
+
+def _substituicao_retroativa_compacta(LU, y):
+    """Resolve Ux = y (U guardada na diagonal e acima dela em LU)"""
+    x = np.array(y, dtype=LU.dtype)
+    for i in range(LU.shape[0] - 1, -1, -1):
+        if LU[i, i] == 0:
+            raise ValueError("Pivô nulo encontrado na substituição retroativa.")
+        x[i] = (x[i] - LU[i, i + 1:] @ x[i + 1:]) / LU[i, i]
+    return x
+
+def _resolver_LU_compacto(LU, perm, b):
+    """Resolve LUx = b[perm] com substituições vetorizadas sobre a forma compacta"""
+    return _substituicao_retroativa_compacta(LU, _substituicao_direta_compacta(LU, perm, b))
+
 def substituicao_direta(L, b):
     n = len(L)
     y = [0.0] * n
@@ -162,14 +300,1123 @@ def substituicao_retroativa(U, y):
 
 def calcular_residuo(A, b, x):
     """Calcula o resíduo do sistema linear r = b - Ax"""
+    if np is not None and isinstance(A, np.ndarray):
+        return np.asarray(b, dtype=float) - A @ np.asarray(x, dtype=float)
     Ax = multiplicar_matriz_vetor(A, x)
     residuo = [b[i] - Ax[i] for i in range(len(b))]
     return residuo
 
-def resolver_por_LU(A, b):
-    L, U = decomposicao_LU(A)
-    y = substituicao_direta(L, b)
-    x = substituicao_retroativa(U, y)
+class FatoracaoLU:
+    """
+    Fatoração LU reutilizável: fatora A uma única vez e resolve o sistema
+    para quantos vetores b forem necessários.
+
+    Os fatores ficam na forma compacta (LU, perm) e cada novo lado direito
+    custa apenas as substituições O(n²). resolver() aceita um vetor b de
+    tamanho n ou uma matriz B (n x k) com k lados direitos de uma só vez.
+    """
+
+    tipo = "LU"
+
+    def __init__(self, A, pivotacao=True, motor="python"):
+        if pivotacao and motor == "numpy":
+            self.LU, self.perm = decomposicao_LU_blocada(A)
+        elif pivotacao:
+            perm, L, U = decomposicao_LU_pivotacao(A, retornar_perm=True)
+            self.LU = np.tril(L, -1) + np.triu(U)
+            self.perm = np.array(perm)
+        else:
+            L, U = decomposicao_LU(A)
+            self.LU = np.tril(L, -1) + np.triu(U)
+            self.perm = np.arange(len(A))
+        self.n = self.LU.shape[0]
+
+    def resolver(self, b):
+        """Resolve Ax = b (b vetor de tamanho n ou matriz n x k)"""
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError("O vetor b deve ter exatamente n elementos.")
+        return _resolver_LU_compacto(self.LU, self.perm, b)
+
+    solve = resolver
+
+    def matrizes(self):
+        """Retorna P, L, U como listas, no formato de decomposicao_LU_pivotacao"""
+        P, L, U = expandir_PLU(self.LU, self.perm)
+        return P.tolist(), L.tolist(), U.tolist()
+
+def detectar_largura_banda(A):
+    """
+    Detecta as larguras de banda de A: p (abaixo da diagonal) e q (acima).
+    A[i][j] == 0 sempre que j < i - p ou j > i + q.
+    """
+    i, j = np.nonzero(np.asarray(A, dtype=float))
+    if i.size == 0:
+        return 0, 0
+    return max(int(np.max(i - j)), 0), max(int(np.max(j - i)), 0)
+
+def matriz_para_banda(A, p=None, q=None):
+    """
+    Converte uma matriz densa para o formato de banda (apenas as diagonais).
+
+    Retorna (ab, p, q), em que ab tem forma (p + q + 1, n) e
+    ab[q + i - j, j] = A[i][j]. A linha q de ab é a diagonal principal.
+    Se p ou q não forem informados, são detectados automaticamente.
+    """
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    if p is None or q is None:
+        p_det, q_det = detectar_largura_banda(A)
+        p = p_det if p is None else p
+        q = q_det if q is None else q
+    ab = np.zeros((p + q + 1, n))
+    for d in range(-p, q + 1):
+        diag = np.diagonal(A, d)
+        if d >= 0:
+            ab[q - d, d:] = diag
+        else:
+            ab[q - d, :n + d] = diag
+    return ab, p, q
+
+# A partir deste tamanho metodo="auto" usa a redução cíclica vetorizada
+LIMIAR_REDUCAO_CICLICA = 10000
+
+def resolver_tridiagonal(a, b, c, d, metodo="auto"):
+    """
+    Resolve um sistema tridiagonal sem montar a matriz.
+    a: subdiagonal (n-1), b: diagonal principal (n), c: superdiagonal (n-1),
+    d: termos independentes (n).
+
+    metodo="thomas" usa o algoritmo de Thomas, O(n) e sequencial (um laço
+    em Python sobre arrays float64 pré-alocados): o mais rápido para n
+    pequeno. metodo="reducao_ciclica" usa redução cíclica vetorizada (O(n)
+    operações distribuídas em log2(n) níveis), bem mais rápida para n
+    grande, ao custo de alguns arrays temporários de tamanho n.
+    metodo="auto" escolhe Thomas até LIMIAR_REDUCAO_CICLICA equações e a
+    redução cíclica acima disso.
+    Nenhum dos dois pivota: indicados para matrizes diagonalmente dominantes.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    d = np.asarray(d, dtype=float)
+    n = b.shape[0]
+    if metodo == "auto":
+        metodo = "reducao_ciclica" if n > LIMIAR_REDUCAO_CICLICA else "thomas"
+    if metodo == "reducao_ciclica":
+        return _reducao_ciclica(a, b, c, d)
+    if metodo != "thomas":
+        raise ValueError(f"Método tridiagonal desconhecido: {metodo}")
+
+    # Varreduras em trechos convertidos para listas (aritmética de floats do
+    # Python, mais rápida que escalares NumPy) com memória limitada ao trecho
+    trecho = 65536
+    c_linha = np.empty(n)
+    x = np.empty(n)  # guarda d' e, depois da volta, a solução
+    c_anterior = d_anterior = 0.0
+    for i0 in range(0, n, trecho):
+        i1 = min(i0 + trecho, n)
+        sub = ([0.0] if i0 == 0 else []) + a[max(i0 - 1, 0):i1 - 1].tolist()
+        sup = c[i0:i1].tolist() + ([0.0] if i1 == n else [])
+        c_trecho, d_trecho = [], []
+        for ai, bi, ci, di in zip(sub, b[i0:i1].tolist(), sup, d[i0:i1].tolist()):
+            denominador = bi - ai * c_anterior
+            if denominador == 0:
+                raise ValueError("Pivô nulo encontrado no algoritmo de Thomas.")
+            c_anterior = ci / denominador
+            d_anterior = (di - ai * d_anterior) / denominador
+            c_trecho.append(c_anterior)
+            d_trecho.append(d_anterior)
+        c_linha[i0:i1] = c_trecho
+        x[i0:i1] = d_trecho
+
+    x_seguinte = 0.0
+    for i1 in range(n, 0, -trecho):
+        i0 = max(i1 - trecho, 0)
+        x_trecho = []
+        for ci, di in zip(reversed(c_linha[i0:i1].tolist()), reversed(x[i0:i1].tolist())):
+            x_seguinte = di - ci * x_seguinte
+            x_trecho.append(x_seguinte)
+        x[i0:i1] = x_trecho[::-1]
+    return x
+
+def _reducao_ciclica(a, b, c, d):
+    """Redução cíclica par-ímpar (a, c já alinhados com b: a[0] = c[-1] = 0)"""
+    if b.shape[0] == len(a) + 1:
+        a = np.concatenate(([0.0], a))
+        c = np.concatenate((c, [0.0]))
+    n = b.shape[0]
+    if n == 1:
+        if b[0] == 0:
+            raise ValueError("Pivô nulo encontrado na redução cíclica.")
+        return d / b
+
+    # Bordas artificiais (linhas identidade) evitam casos especiais nos extremos
+    ap = np.concatenate(([0.0], a, [0.0]))
+    bp = np.concatenate(([1.0], b, [1.0]))
+    cp = np.concatenate(([0.0], c, [0.0]))
+    dp = np.concatenate(([0.0], d, [0.0]))
+
+    k = np.arange(1, n + 1, 2)  # linhas pares do sistema original
+    if np.any(bp[k - 1] == 0) or np.any(bp[k + 1] == 0):
+        raise ValueError("Pivô nulo encontrado na redução cíclica.")
+    alfa = -ap[k] / bp[k - 1]
+    gama = -cp[k] / bp[k + 1]
+    x_par = _reducao_ciclica(alfa * ap[k - 1],
+                             bp[k] + alfa * cp[k - 1] + gama * ap[k + 1],
+                             gama * cp[k + 1],
+                             dp[k] + alfa * dp[k - 1] + gama * dp[k + 1])
+
+    x = np.zeros(n + 2)
+    x[k] = x_par
+    k_impar = np.arange(2, n + 1, 2)
+    x[k_impar] = (dp[k_impar] - ap[k_impar] * x[k_impar - 1]
+                  - cp[k_impar] * x[k_impar + 1]) / bp[k_impar]
+    return x[1:-1]
+
+def decomposicao_LU_banda(ab, p, q):
+    """
+    Decomposição LU com pivotação parcial no formato de banda, O(n·p·(p+q)).
+
+    ab é a matriz no formato de matriz_para_banda. Retorna (lub, ipiv): lub
+    tem forma (2p + q + 1, n) e guarda U (largura superior p + q, devido às
+    trocas de linha) nas linhas 0..p+q e os multiplicadores de L nas linhas
+    abaixo; ipiv[k] é a linha trocada com a linha k no passo k.
+    """
+    ab = np.asarray(ab, dtype=float)
+    n = ab.shape[1]
+    kv = p + q
+    lub = np.zeros((2 * p + q + 1, n))
+    lub[p:, :] = ab
+    ipiv = np.arange(n)
+
+    for k in range(n):
+        m = min(p, n - 1 - k)
+        r = k + int(np.argmax(np.abs(lub[kv:kv + m + 1, k])))
+        if lub[kv + r - k, k] == 0:
+            raise ValueError("Matriz singular: não é possível decompor em LU.")
+        ipiv[k] = r
+        colunas = np.arange(k, min(k + kv, n - 1) + 1)
+        if r != k:
+            linha_k = kv + k - colunas
+            linha_r = kv + r - colunas
+            lub[linha_k, colunas], lub[linha_r, colunas] = \
+                lub[linha_r, colunas], lub[linha_k, colunas].copy()
+        if m == 0:
+            continue
+        lub[kv + 1:kv + m + 1, k] /= lub[kv, k]
+        colunas = colunas[1:]
+        if colunas.size:
+            linha_u = lub[kv + k - colunas, colunas]
+            linhas = kv + np.arange(k + 1, k + m + 1)[:, None] - colunas[None, :]
+            lub[linhas, colunas] -= np.outer(lub[kv + 1:kv + m + 1, k], linha_u)
+    return lub, ipiv
+
+def resolver_LU_banda(lub, ipiv, p, q, b):
+    """Resolve Ax = b a partir da decomposição de decomposicao_LU_banda"""
+    n = lub.shape[1]
+    kv = p + q
+    x = np.array(b, dtype=float)
+
+    for k in range(n):
+        r = ipiv[k]
+        if r != k:
+            x[k], x[r] = x[r], x[k]
+        m = min(p, n - 1 - k)
+        if m:
+            x[k + 1:k + m + 1] -= lub[kv + 1:kv + m + 1, k] * x[k]
+
+    for i in range(n - 1, -1, -1):
+        fim = min(i + kv, n - 1)
+        colunas = np.arange(i + 1, fim + 1)
+        soma = lub[kv + i - colunas, colunas] @ x[i + 1:fim + 1]
+        x[i] = (x[i] - soma) / lub[kv, i]
+    return x
+
+def resolver_sistema_banda(A, b):
+    """
+    Resolve Ax = b aproveitando a estrutura de banda de A (densa).
+    Detecta a largura de banda; sistemas tridiagonais estritamente
+    diagonalmente dominantes (|b_i| > |a_i| + |c_i|), em que Thomas é
+    estável sem pivotação, usam o algoritmo de Thomas; os demais usam o
+    LU de banda com pivotação parcial.
+    """
+    ab, p, q = matriz_para_banda(A)
+    if p == 1 and q == 1:
+        a, d, c = ab[2, :-1], ab[1], ab[0, 1:]
+        fora_da_diagonal = np.zeros_like(d)
+        fora_da_diagonal[:-1] += np.abs(c)
+        fora_da_diagonal[1:] += np.abs(a)
+        if np.all(np.abs(d) > fora_da_diagonal):
+            return resolver_tridiagonal(a, d, c, b).tolist()
+    lub, ipiv = decomposicao_LU_banda(ab, p, q)
+    return resolver_LU_banda(lub, ipiv, p, q, b).tolist()
+
+class MatrizCSR:
+    """
+    Matriz esparsa no formato CSR (Compressed Sparse Row).
+
+    dados guarda os valores não nulos linha a linha, indices a coluna de cada
+    valor e ponteiros[i]:ponteiros[i+1] delimita os valores da linha i.
+    A memória é O(nnz) em vez de O(n²).
+    """
+
+    def __init__(self, dados, indices, ponteiros, forma):
+        self.dados = np.asarray(dados, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.ponteiros = np.asarray(ponteiros, dtype=np.int64)
+        self.forma = tuple(forma)
+        # Linha de cada valor armazenado, usada no produto vetorizado
+        self._linhas = np.repeat(np.arange(self.forma[0]), np.diff(self.ponteiros))
+
+    @classmethod
+    def de_coordenadas(cls, linhas, colunas, valores, forma):
+        """Monta a matriz a partir de triplas (i, j, valor); repetições são somadas"""
+        linhas = np.asarray(linhas, dtype=np.int64)
+        colunas = np.asarray(colunas, dtype=np.int64)
+        valores = np.asarray(valores, dtype=float)
+        n_linhas, n_colunas = forma
+        chave = linhas * n_colunas + colunas
+        ordem = np.argsort(chave, kind="stable")
+        chave, valores = chave[ordem], valores[ordem]
+        chave_unica, inicio = np.unique(chave, return_index=True)
+        if valores.size:
+            valores = np.add.reduceat(valores, inicio)
+        linhas = chave_unica // n_colunas
+        colunas = chave_unica % n_colunas
+        ponteiros = np.concatenate(([0], np.cumsum(np.bincount(linhas, minlength=n_linhas))))
+        return cls(valores, colunas, ponteiros, forma)
+
+    @classmethod
+    def de_densa(cls, A):
+        """Converte uma matriz densa (lista de listas ou array) para CSR"""
+        A = np.asarray(A, dtype=float)
+        linhas, colunas = np.nonzero(A)
+        return cls.de_coordenadas(linhas, colunas, A[linhas, colunas], A.shape)
+
+    @property
+    def nnz(self):
+        return self.dados.size
+
+    def diagonal(self):
+        """Retorna a diagonal principal como vetor"""
+        d = np.zeros(min(self.forma))
+        mascara = self._linhas == self.indices
+        d[self._linhas[mascara]] = self.dados[mascara]
+        return d
+
+    def para_densa(self):
+        A = np.zeros(self.forma)
+        A[self._linhas, self.indices] = self.dados
+        return A
+
+def multiplicar_csr_vetor(A, vetor):
+    """Multiplica uma matriz CSR por um vetor em O(nnz)"""
+    vetor = np.asarray(vetor, dtype=float)
+    if A.forma[1] != vetor.shape[0]:
+        raise ValueError("Número de colunas da matriz deve ser igual ao número de linhas do vetor.")
+    return np.bincount(A._linhas, weights=A.dados * np.take(vetor, A.indices),
+                       minlength=A.forma[0])
+
+def calcular_residuo_csr(A, b, x):
+    """Calcula o resíduo r = b - Ax para uma matriz CSR"""
+    return np.asarray(b, dtype=float) - multiplicar_csr_vetor(A, x)
+
+def matriz_poisson_csr(nx, ny=None):
+    """
+    Monta a matriz do Laplaciano discreto (-Δ, 5 pontos em 2D ou 3 pontos
+    em 1D se ny=None) em CSR. Útil para testar os métodos iterativos.
+    """
+    if ny is None:
+        i = np.arange(nx)
+        linhas = np.concatenate((i, i[1:], i[:-1]))
+        colunas = np.concatenate((i, i[:-1], i[1:]))
+        valores = np.concatenate((np.full(nx, 2.0), np.full(2 * (nx - 1), -1.0)))
+        return MatrizCSR.de_coordenadas(linhas, colunas, valores, (nx, nx))
+
+    n = nx * ny
+    k = np.arange(n)
+    ix = k % nx
+    linhas, colunas, valores = [k], [k], [np.full(n, 4.0)]
+    for vizinho, valido in ((k - 1, ix > 0), (k + 1, ix < nx - 1),
+                            (k - nx, k >= nx), (k + nx, k < n - nx)):
+        linhas.append(k[valido])
+        colunas.append(vizinho[valido])
+        valores.append(np.full(np.count_nonzero(valido), -1.0))
+    return MatrizCSR.de_coordenadas(np.concatenate(linhas), np.concatenate(colunas),
+                                    np.concatenate(valores), (n, n))
+
+def _relatorio_iterativo(convergiu, iteracoes, residuos):
+    return {"convergiu": convergiu, "iteracoes": iteracoes, "residuos": residuos}
+
+def jacobi(A, b, x0=None, tolerancia=1e-8, max_iteracoes=10000):
+    """
+    Método de Jacobi para matrizes CSR.
+
+    Para quando ||b - Ax|| / ||b|| < tolerancia ou após max_iteracoes.
+    Retorna (x, relatorio) com as chaves "convergiu", "iteracoes" e
+    "residuos" (histórico da norma do resíduo relativo).
+    """
+    b = np.asarray(b, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    d = A.diagonal()
+    if np.any(d == 0):
+        raise ValueError("Diagonal com elemento nulo: o método de Jacobi não se aplica.")
+    norma_b = np.linalg.norm(b) or 1.0
+
+    residuos = []
+    for k in range(1, max_iteracoes + 1):
+        r = calcular_residuo_csr(A, b, x)
+        residuos.append(np.linalg.norm(r) / norma_b)
+        if residuos[-1] < tolerancia:
+            return x, _relatorio_iterativo(True, k - 1, residuos)
+        x = x + r / d
+    r = calcular_residuo_csr(A, b, x)
+    residuos.append(np.linalg.norm(r) / norma_b)
+    return x, _relatorio_iterativo(residuos[-1] < tolerancia, max_iteracoes, residuos)
+
+def gauss_seidel(A, b, x0=None, omega=1.0, tolerancia=1e-8, max_iteracoes=10000):
+    """
+    Método de Gauss-Seidel (omega=1) ou SOR (0 < omega < 2) para matrizes CSR.
+
+    Cada varredura é sequencial por natureza (usa os valores já atualizados);
+    o resíduo de parada é calculado de forma vetorizada. Retorna (x, relatorio)
+    como em jacobi.
+    """
+    if not 0 < omega < 2:
+        raise ValueError("O fator de relaxação omega deve estar em (0, 2).")
+    b = np.asarray(b, dtype=float)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    d = A.diagonal()
+    if np.any(d == 0):
+        raise ValueError("Diagonal com elemento nulo: o método de Gauss-Seidel não se aplica.")
+    norma_b = np.linalg.norm(b) or 1.0
+
+    dados, indices, ponteiros = A.dados.tolist(), A.indices.tolist(), A.ponteiros.tolist()
+    diag, bl = d.tolist(), b.tolist()
+    n = len(bl)
+
+    residuos = [np.linalg.norm(calcular_residuo_csr(A, b, x)) / norma_b]
+    for k in range(1, max_iteracoes + 1):
+        if residuos[-1] < tolerancia:
+            return x, _relatorio_iterativo(True, k - 1, residuos)
+        xl = x.tolist()
+        for i in range(n):
+            soma = 0.0
+            for p in range(ponteiros[i], ponteiros[i + 1]):
+                soma += dados[p] * xl[indices[p]]
+            # soma inclui o termo diagonal; (b_i - soma) / a_ii é a correção de Gauss-Seidel
+            xl[i] += omega * (bl[i] - soma) / diag[i]
+        x = np.array(xl)
+        residuos.append(np.linalg.norm(calcular_residuo_csr(A, b, x)) / norma_b)
+    return x, _relatorio_iterativo(residuos[-1] < tolerancia, max_iteracoes, residuos)
+
+def gradientes_conjugados(A, b, x0=None, precondicionador="jacobi", tolerancia=1e-8,
+                          max_iteracoes=None):
+    """
+    Gradientes Conjugados precondicionado para matrizes CSR simétricas
+    positivas definidas.
+
+    precondicionador="jacobi" usa a diagonal de A; None desativa o
+    precondicionamento. Por padrão faz no máximo n iterações. Retorna
+    (x, relatorio) como em jacobi.
+    """
+    b = np.asarray(b, dtype=float)
+    n = b.shape[0]
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=float)
+    if max_iteracoes is None:
+        max_iteracoes = n
+    if precondicionador == "jacobi":
+        d = A.diagonal()
+        if np.any(d <= 0):
+            raise ValueError("A diagonal deve ser positiva para o precondicionador de Jacobi.")
+        inv_d = 1.0 / d
+    elif precondicionador is None:
+        inv_d = np.ones(n)
+    else:
+        raise ValueError(f"Precondicionador desconhecido: {precondicionador}")
+    norma_b = np.linalg.norm(b) or 1.0
+
+    r = calcular_residuo_csr(A, b, x)
+    residuos = [np.linalg.norm(r) / norma_b]
+    z = inv_d * r
+    direcao = z.copy()
+    rz = r @ z
+    for k in range(1, max_iteracoes + 1):
+        if residuos[-1] < tolerancia:
+            return x, _relatorio_iterativo(True, k - 1, residuos)
+        Ad = multiplicar_csr_vetor(A, direcao)
+        dAd = direcao @ Ad
+        if dAd <= 0:
+            raise ValueError("A matriz não é simétrica positiva definida.")
+        alfa = rz / dAd
+        x += alfa * direcao
+        r -= alfa * Ad
+        residuos.append(np.linalg.norm(r) / norma_b)
+        z = inv_d * r
+        rz_novo = r @ z
+        direcao = z + (rz_novo / rz) * direcao
+        rz = rz_novo
+    return x, _relatorio_iterativo(residuos[-1] < tolerancia, max_iteracoes, residuos)
+
+def eh_simetrica(A, tolerancia=1e-12):
+    """Verifica se A é simétrica (|A - Aᵀ| <= tolerancia * max|A|)"""
+    A = np.asarray(A, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        return False
+    return bool(np.max(np.abs(A - A.T), initial=0.0) <= tolerancia * np.max(np.abs(A), initial=0.0))
+
+def _fatoracao_cholesky(A, tamanho_bloco):
+    """
+    Fatoração de Cholesky A = L Lᵀ em blocos, que lê e escreve apenas o
+    triângulo inferior do array de trabalho (o superior fica sem uso).
+    """
+    W = np.array(A, dtype=float)
+    n = W.shape[0]
+
+    for k0 in range(0, n, tamanho_bloco):
+        k1 = min(k0 + tamanho_bloco, n)
+
+        # Fatoração do painel de colunas k0:k1
+        for j in range(k0, k1):
+            d = W[j, j]
+            if d <= 0:
+                raise ValueError("A matriz não é positiva definida.")
+            W[j + 1:, j + 1:k1] -= np.outer(W[j + 1:, j], W[j + 1:k1, j]) / d
+            W[j, j] = np.sqrt(d)
+            W[j + 1:, j] /= W[j, j]
+
+        if k1 < n:
+            # Atualização do triângulo inferior restante, bloco-coluna a bloco-coluna
+            L21 = W[k1:, k0:k1]
+            for c0 in range(k1, n, tamanho_bloco):
+                c1 = min(c0 + tamanho_bloco, n)
+                W[c0:, c0:c1] -= L21[c0 - k1:] @ L21[c0 - k1:c1 - k1].T
+    return W
+
+def _trocar_simetrico(W, perm, i, j):
+    """Troca linhas e colunas i e j de W (simétrica) e as entradas de perm"""
+    if i != j:
+        W[[i, j], :] = W[[j, i], :]
+        W[:, [i, j]] = W[:, [j, i]]
+        perm[[i, j]] = perm[[j, i]]
+
+def _fatoracao_bunch_kaufman(A):
+    """
+    Fatoração P A Pᵀ = L D Lᵀ com pivotação simétrica de Bunch-Kaufman:
+    D é bloco-diagonal com blocos 1x1 e 2x2, o que mantém os multiplicadores
+    limitados também em matrizes indefinidas. Retorna (W, perm, blocos):
+    L (unitária) abaixo dos blocos diagonais de W, D nos blocos diagonais,
+    e blocos com o índice inicial e o tamanho de cada bloco de D.
+    """
+    W = np.array(A, dtype=float)
+    n = W.shape[0]
+    perm = np.arange(n)
+    blocos = []
+    alfa = (1 + np.sqrt(17)) / 8
+
+    k = 0
+    while k < n:
+        tamanho = 1
+        if k < n - 1:
+            r = k + 1 + int(np.argmax(np.abs(W[k + 1:, k])))
+            lambda_ = abs(W[r, k])
+        else:
+            r, lambda_ = k, 0.0
+        if max(abs(W[k, k]), lambda_) == 0:
+            raise ValueError("Matriz singular: não é possível decompor em LDLᵀ.")
+        if abs(W[k, k]) < alfa * lambda_:
+            sigma = np.max(np.abs(np.delete(W[r, k:], r - k)))
+            if abs(W[k, k]) * sigma >= alfa * lambda_**2:
+                pass
+            elif abs(W[r, r]) >= alfa * sigma:
+                _trocar_simetrico(W, perm, k, r)
+            else:
+                _trocar_simetrico(W, perm, k + 1, r)
+                tamanho = 2
+
+        fim = k + tamanho
+        D = W[k:fim, k:fim]
+        C = W[fim:, k:fim]
+        if tamanho == 1:
+            L_bloco = C / D[0, 0]
+        else:
+            L_bloco = np.linalg.solve(D, C.T).T
+        W[fim:, fim:] -= L_bloco @ C.T
+        W[fim:, k:fim] = L_bloco
+        W[k:fim, fim:] = L_bloco.T
+        blocos.append((k, tamanho))
+        k = fim
+    return W, perm, blocos
+
+class FatoracaoSimetrica:
+    """
+    Fatoração de Cholesky (A simétrica positiva definida) ou LDLᵀ com
+    pivotação de Bunch-Kaufman (A simétrica indefinida).
+
+    O Cholesky usa cerca de metade das operações da decomposição LU; os
+    fatores ficam num único array n x n, como na forma compacta de
+    FatoracaoLU. Oferece a mesma interface resolver(b) de FatoracaoLU.
+    """
+
+    def __init__(self, A, tipo="cholesky", tamanho_bloco=64):
+        if tipo not in ("cholesky", "LDLt"):
+            raise ValueError(f"Tipo de fatoração simétrica desconhecido: {tipo}")
+        if not eh_simetrica(A):
+            raise ValueError("A matriz não é simétrica.")
+        self.tipo = tipo
+        if tipo == "cholesky":
+            self.L = _fatoracao_cholesky(A, tamanho_bloco)
+            self.perm = None
+        else:
+            self.L, self.perm, self.blocos = _fatoracao_bunch_kaufman(A)
+        self.n = self.L.shape[0]
+
+    def resolver(self, b):
+        """Resolve Ax = b (b vetor de tamanho n ou matriz n x k)"""
+        y = np.array(b, dtype=float)
+        if y.shape[0] != self.n:
+            raise ValueError("O vetor b deve ter exatamente n elementos.")
+        L, n = self.L, self.n
+
+        if self.tipo == "cholesky":
+            for i in range(n):
+                y[i] -= L[i, :i] @ y[:i]
+                y[i] /= L[i, i]
+            for i in range(n - 1, -1, -1):
+                y[i] -= L[i + 1:, i] @ y[i + 1:]
+                y[i] /= L[i, i]
+            return y
+
+        y = y[self.perm]
+        for k, tamanho in self.blocos:
+            fim = k + tamanho
+            y[fim:] -= L[fim:, k:fim] @ y[k:fim]
+        for k, tamanho in self.blocos:
+            fim = k + tamanho
+            y[k:fim] = np.linalg.solve(L[k:fim, k:fim], y[k:fim])
+        for k, tamanho in reversed(self.blocos):
+            fim = k + tamanho
+            y[k:fim] -= L[fim:, k:fim].T @ y[fim:]
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
+
+    solve = resolver
+
+def fatorar(A):
+    """
+    Escolhe a fatoração pela estrutura de A: Cholesky se A for simétrica
+    positiva definida, LDLᵀ com pivotação de Bunch-Kaufman se for apenas
+    simétrica e LU com pivotação (motor NumPy) nos demais casos.
+    """
+    if eh_simetrica(A):
+        try:
+            return FatoracaoSimetrica(A, "cholesky")
+        except ValueError:
+            return FatoracaoSimetrica(A, "LDLt")
+    return FatoracaoLU(A, motor="numpy")
+
+def _padrao_simetrico(A):
+    """Padrão de adjacência de A + Aᵀ (sem a diagonal) como listas de vizinhos"""
+    n = A.forma[0]
+    linhas = np.concatenate((A._linhas, A.indices))
+    colunas = np.concatenate((A.indices, A._linhas))
+    fora_diagonal = linhas != colunas
+    chave = np.unique(linhas[fora_diagonal] * n + colunas[fora_diagonal])
+    linhas, colunas = chave // n, chave % n
+    ponteiros = np.concatenate(([0], np.cumsum(np.bincount(linhas, minlength=n))))
+    return [colunas[ponteiros[i]:ponteiros[i + 1]].tolist() for i in range(n)]
+
+def ordenacao_RCM(A):
+    """
+    Ordenação Reverse Cuthill-McKee: busca em largura a partir de um nó
+    pseudo-periférico, visitando os vizinhos em ordem crescente de grau, e
+    inverte a ordem obtida. Reduz a largura de banda (e o preenchimento).
+    Retorna o vetor de permutação.
+    """
+    vizinhos = _padrao_simetrico(A)
+    n = len(vizinhos)
+    grau = [len(v) for v in vizinhos]
+    visitado = [False] * n
+    ordem = []
+
+    def busca_em_largura(inicio, marcar):
+        vistos = {inicio}
+        niveis = [inicio]
+        fila = [inicio]
+        for v in fila:
+            novos = sorted((u for u in vizinhos[v] if u not in vistos and not visitado[u]),
+                           key=grau.__getitem__)
+            vistos.update(novos)
+            fila.extend(novos)
+        if marcar:
+            for v in fila:
+                visitado[v] = True
+        return fila
+
+    for inicio in sorted(range(n), key=grau.__getitem__):
+        if visitado[inicio]:
+            continue
+        # Nó pseudo-periférico: o último visitado (de menor grau) em uma BFS
+        componente = busca_em_largura(inicio, marcar=False)
+        ultimo = min(componente[-max(1, len(componente) // 10):], key=grau.__getitem__)
+        ordem.extend(busca_em_largura(ultimo, marcar=True))
+    return np.array(ordem[::-1], dtype=np.int64)
+
+def ordenacao_grau_minimo(A):
+    """
+    Ordenação de grau mínimo: elimina a cada passo o nó de menor grau no grafo
+    de eliminação, conectando seus vizinhos entre si. Os graus ficam numa fila
+    de prioridade com atualização preguiçosa (entradas obsoletas são
+    descartadas). Retorna o vetor de permutação.
+    """
+    vizinhos = [set(v) for v in _padrao_simetrico(A)]
+    n = len(vizinhos)
+    fila = [(len(v), i) for i, v in enumerate(vizinhos)]
+    heapq.heapify(fila)
+    eliminado = [False] * n
+    ordem = []
+
+    while fila:
+        grau, v = heapq.heappop(fila)
+        if eliminado[v] or grau != len(vizinhos[v]):
+            continue
+        eliminado[v] = True
+        ordem.append(v)
+        clique = vizinhos[v]
+        for u in clique:
+            vizinhos[u].discard(v)
+            vizinhos[u].update(clique)
+            vizinhos[u].discard(u)
+            heapq.heappush(fila, (len(vizinhos[u]), u))
+        vizinhos[v] = set()
+    return np.array(ordem, dtype=np.int64)
+
+_ORDENACOES = {"rcm": ordenacao_RCM, "grau_minimo": ordenacao_grau_minimo}
+
+def _ordenar(A, ordenacao):
+    if ordenacao is None:
+        return np.arange(A.forma[0])
+    if ordenacao not in _ORDENACOES:
+        raise ValueError(f"Ordenação desconhecida: {ordenacao}")
+    return _ORDENACOES[ordenacao](A)
+
+def fatoracao_simbolica(A, perm):
+    """
+    Fatoração simbólica de A[perm][:, perm] sobre o padrão de A + Aᵀ, usando a
+    árvore de eliminação: o padrão da coluna j de L é o da coluna j de A
+    (abaixo da diagonal) unido aos padrões das colunas filhas de j.
+    Retorna a lista de padrões (índices de linha) das colunas de L.
+    """
+    n = A.forma[0]
+    posicao = np.empty(n, dtype=np.int64)
+    posicao[perm] = np.arange(n)
+    vizinhos = _padrao_simetrico(A)
+
+    filhos = [[] for _ in range(n)]
+    colunas_L = [None] * n
+    for j in range(n):
+        padrao = {i for i in posicao[vizinhos[perm[j]]].tolist() if i > j}
+        for c in filhos[j]:
+            padrao.update(i for i in colunas_L[c] if i > j)
+        colunas_L[j] = np.array(sorted(padrao), dtype=np.int64)
+        if padrao:
+            filhos[min(padrao)].append(j)
+    return colunas_L
+
+def _relatorio_simbolico(A, ordenacao, colunas_L):
+    n = A.forma[0]
+    tamanhos = np.array([c.size for c in colunas_L], dtype=np.int64)
+    nnz_L = int(tamanhos.sum())
+    nnz_U = nnz_L + n
+    return {"ordenacao": ordenacao, "nnz_A": A.nnz, "nnz_L": nnz_L, "nnz_U": nnz_U,
+            "preenchimento": nnz_L + nnz_U - A.nnz,
+            "flops": int(np.sum(2 * tamanhos**2 + tamanhos))}
+
+def analisar_ordenacao(A, ordenacao="grau_minimo"):
+    """
+    Executa apenas a ordenação e a fatoração simbólica e informa quantos não
+    nulos L e U terão, o preenchimento e o número de operações da fatoração
+    numérica, para escolher a ordenação antes de fatorar.
+    """
+    perm = _ordenar(A, ordenacao)
+    return _relatorio_simbolico(A, ordenacao, fatoracao_simbolica(A, perm))
+
+class FatoracaoLUEsparsa:
+    """
+    Decomposição LU esparsa direta de uma MatrizCSR.
+
+    Etapas: ordenação redutora de preenchimento (ordenacao="rcm",
+    "grau_minimo" ou None), fatoração simbólica para pré-alocar os padrões de
+    L e U e fatoração numérica (left-looking) de A[perm][:, perm]. Os pivôs
+    são os da diagonal (sem pivotação numérica), o que é adequado para
+    matrizes diagonalmente dominantes ou simétricas positivas definidas.
+    relatorio traz não nulos, preenchimento e operações.
+    """
+
+    tipo = "LU esparsa"
+
+    def __init__(self, A, ordenacao="grau_minimo"):
+        n = A.forma[0]
+        if A.forma[1] != n:
+            raise ValueError("A matriz deve ser quadrada.")
+        self.n = n
+        self.perm = _ordenar(A, ordenacao)
+        self.colunas_L = fatoracao_simbolica(A, self.perm)
+        self.relatorio = _relatorio_simbolico(A, ordenacao, self.colunas_L)
+
+        # Padrão de U por coluna: k < j com L[j, k] != 0, mais a diagonal
+        linhas_U = [[] for _ in range(n)]
+        for k, padrao in enumerate(self.colunas_L):
+            for j in padrao.tolist():
+                linhas_U[j].append(k)
+        self.colunas_U = [np.array(linhas_U[j] + [j], dtype=np.int64) for j in range(n)]
+
+        # Colunas de A[perm][:, perm] (formato CSC)
+        posicao = np.empty(n, dtype=np.int64)
+        posicao[self.perm] = np.arange(n)
+        linhas_B = posicao[A._linhas]
+        colunas_B = posicao[A.indices]
+        ordem = np.argsort(colunas_B, kind="stable")
+        linhas_B, valores_B = linhas_B[ordem], A.dados[ordem]
+        ponteiros_B = np.concatenate(([0], np.cumsum(np.bincount(colunas_B, minlength=n))))
+
+        self.valores_L = [None] * n
+        self.valores_U = [None] * n
+        x = np.zeros(n)
+        for j in range(n):
+            inicio, fim = ponteiros_B[j], ponteiros_B[j + 1]
+            x[linhas_B[inicio:fim]] = valores_B[inicio:fim]
+            for k in self.colunas_U[j][:-1].tolist():
+                if x[k] != 0:
+                    x[self.colunas_L[k]] -= self.valores_L[k] * x[k]
+            if x[j] == 0:
+                raise ValueError("Pivô nulo na LU esparsa (sem pivotação): "
+                                 "use uma fatoração densa com pivotação.")
+            self.valores_U[j] = x[self.colunas_U[j]]
+            self.valores_L[j] = x[self.colunas_L[j]] / x[j]
+            x[self.colunas_U[j]] = 0.0
+            x[self.colunas_L[j]] = 0.0
+
+    def resolver(self, b):
+        """Resolve Ax = b para um vetor b de tamanho n"""
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError("O vetor b deve ter exatamente n elementos.")
+        y = b[self.perm]
+        for j in range(self.n):
+            y[self.colunas_L[j]] -= self.valores_L[j] * y[j]
+        for j in range(self.n - 1, -1, -1):
+            y[j] /= self.valores_U[j][-1]
+            y[self.colunas_U[j][:-1]] -= self.valores_U[j][:-1] * y[j]
+        x = np.empty(self.n)
+        x[self.perm] = y
+        return x
+
+    solve = resolver
+
+def gauss_em_lote_vetorizado(A, b):
+    """
+    Eliminação de Gauss com pivotação parcial aplicada a k sistemas de uma
+    vez: A tem forma (k, n, n) e b (k, n). Cada passo de eliminação (busca do
+    pivô, troca de linhas e atualização) é vetorizado sobre todos os sistemas.
+
+    Em vez de lançar ValueError no primeiro sistema singular, retorna
+    (x, singular): singular[i] indica que o sistema i tem pivô nulo, e
+    x[i] fica preenchido com NaN.
+    """
+    A = np.array(A, dtype=float)
+    b = np.array(b, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2] or b.shape != A.shape[:2]:
+        raise ValueError("Esperado A com forma (k, n, n) e b com forma (k, n).")
+    k, n, _ = A.shape
+    sistemas = np.arange(k)
+    singular = np.zeros(k, dtype=bool)
+
+    for i in range(n):
+        p = i + np.argmax(np.abs(A[:, i:, i]), axis=1)
+        singular |= A[sistemas, p, i] == 0
+        linha_i = A[:, i].copy()
+        A[:, i] = A[sistemas, p]
+        A[sistemas, p] = linha_i
+        b[:, i], b[sistemas, p] = b[sistemas, p], b[:, i].copy()
+
+        pivo = np.where(singular, 1.0, A[:, i, i])
+        fator = A[:, i + 1:, i] / pivo[:, None]
+        A[:, i + 1:, i:] -= fator[:, :, None] * A[:, None, i, i:]
+        b[:, i + 1:] -= fator * b[:, i, None]
+
+    x = np.zeros((k, n))
+    diagonal = np.where(singular[:, None], 1.0, np.diagonal(A, axis1=1, axis2=2))
+    for i in range(n - 1, -1, -1):
+        soma = np.einsum("kj,kj->k", A[:, i, i + 1:], x[:, i + 1:])
+        x[:, i] = (b[:, i] - soma) / diagonal[:, i]
+    x[singular] = np.nan
+    return x, singular
+
+def resolver_em_lote(A, b, processos=None, sistemas_por_tarefa=50000):
+    """
+    Resolve k sistemas independentes pequenos (A: (k, n, n), b: (k, n)) com
+    gauss_em_lote_vetorizado. Lotes com mais de sistemas_por_tarefa sistemas
+    são divididos entre processos (processos=None usa um por CPU; 1 executa
+    tudo no processo atual). Retorna (x, singular).
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    k = A.shape[0]
+    if processos == 1 or k <= sistemas_por_tarefa:
+        return gauss_em_lote_vetorizado(A, b)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    cortes = range(0, k, sistemas_por_tarefa)
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        partes = list(executor.map(gauss_em_lote_vetorizado,
+                                   (A[i:i + sistemas_por_tarefa] for i in cortes),
+                                   (b[i:i + sistemas_por_tarefa] for i in cortes)))
+    return (np.concatenate([x for x, _ in partes]),
+            np.concatenate([singular for _, singular in partes]))
+
+def resolver_precisao_mista(A, b, tolerancia=None, max_iteracoes=30):
+    """
+    Resolve Ax = b com refinamento iterativo em precisão mista.
+
+    A é fatorada uma única vez em float32 (metade da memória da fatoração em
+    float64); a cada passo o resíduo é calculado em float64 com
+    calcular_residuo e a correção é obtida com os fatores em float32.
+    Para quando ||r|| <= tolerancia * ||A|| * ||x|| (por padrão eps64 * sqrt(n),
+    isto é, precisão dupla). Se o refinamento estagnar (matriz mal
+    condicionada) recorre à fatoração completa em float64.
+
+    Retorna (x, relatorio) com as chaves "convergiu" (o critério acima vale
+    para a solução final), "iteracoes" (correções do refinamento em float32),
+    "iteracoes_float64" (soluções com a fatoração em float64: 0 ou 1),
+    "residuos", "residuo_final" e "precisao_fatoracao".
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n = A.shape[0]
+    if tolerancia is None:
+        tolerancia = np.finfo(float).eps * np.sqrt(n)
+    norma_A = np.linalg.norm(A, np.inf)
+
+    def convergiu(r, x):
+        return bool(np.all(np.isfinite(r)) and
+                    np.linalg.norm(r, np.inf) <= tolerancia * norma_A * np.linalg.norm(x, np.inf))
+
+    residuos = []
+    correcoes = 0
+    try:
+        LU32, perm = decomposicao_LU_blocada(A, dtype=np.float32)
+        x = _resolver_LU_compacto(LU32, perm, b).astype(float)
+        for k in range(1, max_iteracoes + 1):
+            r = calcular_residuo(A, b, x)
+            residuos.append(float(np.linalg.norm(r)))
+            if not np.all(np.isfinite(r)):
+                break
+            if convergiu(r, x):
+                return x, {"convergiu": True, "iteracoes": correcoes, "iteracoes_float64": 0,
+                           "residuos": residuos, "residuo_final": residuos[-1],
+                           "precisao_fatoracao": "float32"}
+            # Estagnação: o resíduo não caiu nem pela metade
+            if k > 1 and residuos[-1] > 0.5 * residuos[-2]:
+                break
+            x += _resolver_LU_compacto(LU32, perm, r)
+            correcoes += 1
+    except ValueError:
+        # Pivô nulo em precisão simples: a fatoração em float64 decide
+        pass
+
+    LU, perm = decomposicao_LU_blocada(A)
+    x = _resolver_LU_compacto(LU, perm, b)
+    r = calcular_residuo(A, b, x)
+    residuos.append(float(np.linalg.norm(r)))
+    return x, {"convergiu": convergiu(r, x), "iteracoes": correcoes, "iteracoes_float64": 1,
+               "residuos": residuos, "residuo_final": residuos[-1],
+               "precisao_fatoracao": "float64"}
+
+class _MatrizEmDisco:
+    """
+    Acesso a uma matriz n x n em disco por leituras e escritas explícitas
+    (os.pread/os.pwrite), sem mapear o arquivo: só os painéis pedidos ocupam
+    memória, e nada fica residente entre uma leitura e outra.
+
+    O formato é reconhecido pelo conteúdo, não pela extensão: arquivos que
+    começam com o cabeçalho .npy são lidos por ele; os demais são binários
+    crus de float64 (linha por linha), com n deduzido do tamanho do arquivo
+    se não for informado.
+    """
+
+    def __init__(self, caminho, n=None, modo="r"):
+        self.caminho = str(caminho)
+        with open(self.caminho, "rb") as f:
+            eh_npy = f.read(len(np.lib.format.MAGIC_PREFIX)) == np.lib.format.MAGIC_PREFIX
+        if eh_npy:
+            with open(self.caminho, "rb") as f:
+                versao = np.lib.format.read_magic(f)
+                ler_cabecalho = (np.lib.format.read_array_header_1_0 if versao == (1, 0)
+                                 else np.lib.format.read_array_header_2_0)
+                forma, self.fortran, dtype = ler_cabecalho(f)
+                self.offset = f.tell()
+            if len(forma) != 2 or forma[0] != forma[1]:
+                raise ValueError("A matriz deve ser quadrada.")
+            self.n = forma[0]
+        else:
+            tamanho = os.path.getsize(self.caminho) // 8
+            if n is None:
+                n = int(round(np.sqrt(tamanho)))
+            if tamanho != n * n:
+                raise ValueError("O tamanho do arquivo não corresponde a uma matriz n x n de float64.")
+            self.n, self.fortran, self.offset, dtype = n, False, 0, np.float64
+        self.dtype = np.dtype(dtype)
+        self.fd = os.open(self.caminho, os.O_RDWR if modo == "r+" else os.O_RDONLY)
+
+    def fechar(self):
+        os.close(self.fd)
+
+    def _ler(self, posicao, quantidade):
+        tamanho = quantidade * self.dtype.itemsize
+        dados = os.pread(self.fd, tamanho, self.offset + posicao * self.dtype.itemsize)
+        if len(dados) != tamanho:
+            raise ValueError("Arquivo da matriz truncado.")
+        return np.frombuffer(dados, dtype=self.dtype).astype(np.float64)
+
+    def ler_colunas(self, j0, j1, i0=0):
+        """Lê o bloco [i0:n, j0:j1] como array (n - i0) x (j1 - j0)"""
+        n = self.n
+        bloco = np.empty((n - i0, j1 - j0))
+        if self.fortran:
+            for j in range(j0, j1):
+                bloco[:, j - j0] = self._ler(j * n + i0, n - i0)
+        else:
+            for i in range(i0, n):
+                bloco[i - i0] = self._ler(i * n + j0, j1 - j0)
+        return bloco
+
+    def escrever_coluna(self, j, coluna, i0=0):
+        """Grava coluna em [i0:n, j] (apenas matrizes em ordem de colunas)"""
+        dados = np.ascontiguousarray(coluna, dtype=np.float64).tobytes()
+        os.pwrite(self.fd, dados, self.offset + (j * self.n + i0) * 8)
+
+def _largura_painel(n, memoria_max):
+    """
+    Número de colunas por painel para que quatro arrays n x w (o painel,
+    o painel lido do disco, a cópia permutada ou o produto temporário e
+    o painel de L anterior) caibam em memoria_max bytes
+    """
+    return max(1, min(n, memoria_max // (4 * 8 * n)))
+
+def decomposicao_LU_fora_da_memoria(caminho_A, caminho_LU, n=None, memoria_max=256 * 2**20):
+    """
+    Decomposição LU com pivotação parcial fora da memória (out-of-core).
+
+    Lê A do disco (.npy ou binário cru de float64, ver _MatrizEmDisco) e
+    grava a forma compacta LU em caminho_LU (formato .npy em ordem de
+    colunas, qualquer que seja a extensão do nome). A fatoração é feita em
+    painéis de colunas (left-looking): cada painel é
+    atualizado com os painéis anteriores, lidos um de cada vez, e então
+    fatorado. Os painéis são lidos e gravados com E/S explícita, sem mapear
+    os arquivos, e a largura é escolhida de modo que o painel atual, o
+    painel anterior e os temporários (no máximo quatro arrays n x w) caibam
+    em memoria_max bytes, bastando que caibam quatro colunas da matriz.
+
+    Retorna (LU, perm) com LU mapeado em memória (somente leitura) e
+    A[perm] = L @ U.
+    """
+    A = _MatrizEmDisco(caminho_A, n)
+    n = A.n
+    with open(caminho_LU, "wb") as f:
+        np.lib.format.write_array_header_1_0(f, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                                                 "fortran_order": True, "shape": (n, n)})
+        f.truncate(f.tell() + n * n * 8)
+    LU = _MatrizEmDisco(caminho_LU, modo="r+")
+    w = _largura_painel(n, memoria_max)
+    perm = np.arange(n)
+
+    try:
+        for j0 in range(0, n, w):
+            j1 = min(j0 + w, n)
+            painel = A.ler_colunas(j0, j1)[perm]
+
+            # Aplica ao painel as transformações dos painéis já fatorados
+            for k0 in range(0, j0, w):
+                k1 = min(k0 + w, j0)
+                Lk = LU.ler_colunas(k0, k1, k0)
+                for i in range(1, k1 - k0):
+                    painel[k0 + i] -= Lk[i, :i] @ painel[k0:k0 + i]
+                painel[k1:] -= Lk[k1 - k0:] @ painel[k0:k1]
+                del Lk
+
+            # Fatoração do painel (linhas j0 em diante) com pivotação parcial
+            bloco = painel[j0:]
+            trocas = np.arange(n - j0)
+            for j in range(j1 - j0):
+                p = j + int(np.argmax(np.abs(bloco[j:, j])))
+                if bloco[p, j] == 0:
+                    raise ValueError("Matriz singular: não é possível decompor em LU.")
+                if p != j:
+                    bloco[[j, p]] = bloco[[p, j]]
+                    trocas[[j, p]] = trocas[[p, j]]
+                bloco[j + 1:, j] /= bloco[j, j]
+                bloco[j + 1:, j + 1:] -= np.outer(bloco[j + 1:, j], bloco[j, j + 1:])
+            for j in range(j0, j1):
+                LU.escrever_coluna(j, painel[:, j - j0])
+            del painel, bloco
+
+            # Propaga as trocas de linha aos multiplicadores já gravados, coluna a coluna
+            perm[j0:] = perm[j0:][trocas]
+            for j in range(j0):
+                LU.escrever_coluna(j, LU.ler_colunas(j, j + 1, j0)[trocas, 0], j0)
+    finally:
+        A.fechar()
+        LU.fechar()
+
+    return np.load(caminho_LU, mmap_mode="r"), perm
+
+def resolver_LU_fora_da_memoria(LU, perm, b, memoria_max=256 * 2**20):
+    """
+    Resolve Ax = b a partir da forma compacta LU em disco, lendo um painel
+    de colunas por vez. LU pode ser o caminho do .npy ou o array mapeado
+    devolvido por decomposicao_LU_fora_da_memoria.
+    """
+    arquivo = _MatrizEmDisco(getattr(LU, "filename", None) or LU)
+    n = arquivo.n
+    w = _largura_painel(n, memoria_max)
+    y = np.array(b, dtype=float)[perm]
+
+    try:
+        for k0 in range(0, n, w):
+            k1 = min(k0 + w, n)
+            Lk = arquivo.ler_colunas(k0, k1, k0)
+            for i in range(1, k1 - k0):
+                y[k0 + i] -= Lk[i, :i] @ y[k0:k0 + i]
+            y[k1:] -= Lk[k1 - k0:] @ y[k0:k1]
+
+        for k0 in reversed(range(0, n, w)):
+            k1 = min(k0 + w, n)
+            Uk = arquivo.ler_colunas(k0, k1)
+            for i in range(k1 - k0 - 1, -1, -1):
+                linha = k0 + i
+                if Uk[linha, i] == 0:
+                    raise ValueError("Pivô nulo encontrado na substituição retroativa.")
+                y[linha] = (y[linha] - Uk[linha, i + 1:] @ y[linha + 1:k1]) / Uk[linha, i]
+            y[:k0] -= Uk[:k0] @ y[k0:k1]
+    finally:
+        arquivo.fechar()
+    return y
+
+def resolver_por_LU(A, b, fatoracao=None):
+    if fatoracao is None:
+        L, U = decomposicao_LU(A)
+        y = substituicao_direta(L, b)
+        x = substituicao_retroativa(U, y)
+    else:
+        # Substituições vetorizadas sobre a forma compacta; L e U só para exibir
+        y = _substituicao_direta_compacta(fatoracao.LU, fatoracao.perm, b)
+        x = _substituicao_retroativa_compacta(fatoracao.LU, y).tolist()
+        y = y.tolist()
+        _, L, U = fatoracao.matrizes()
     print("\nMatriz L:")
     for linha in L:
         print(linha)
@@ -179,14 +1426,27 @@ def resolver_por_LU(A, b):
     print("\nVetor Y:", y)
     return x
 
-def resolver_por_LU_pivotacao(A, b):
-    P, L, U = decomposicao_LU_pivotacao(A)
-    Pb = multiplicar_matriz_vetor(P, b)
-    y = substituicao_direta(L, Pb)
-    x = substituicao_retroativa(U, y)
+def resolver_por_LU_pivotacao(A, b, motor="python", fatoracao=None):
+    if motor == "numpy":
+        if fatoracao is None:
+            fatoracao = FatoracaoLU(A, motor="numpy")
+        x = fatoracao.resolver(b)
+        print("\nVetor de permutação:", fatoracao.perm.tolist())
+        return x.tolist()
+    if fatoracao is None:
+        perm, L, U = decomposicao_LU_pivotacao(A, retornar_perm=True)
+        Pb = aplicar_permutacao(perm, b)
+        y = substituicao_direta(L, Pb)
+        x = substituicao_retroativa(U, y)
+    else:
+        perm = fatoracao.perm.tolist()
+        y = _substituicao_direta_compacta(fatoracao.LU, fatoracao.perm, b)
+        x = _substituicao_retroativa_compacta(fatoracao.LU, y).tolist()
+        y = y.tolist()
+        _, L, U = fatoracao.matrizes()
     print("\nMatriz P:")
-    for linha in P:
-        print(linha)
+    for p in perm:
+        print([float(p == j) for j in range(len(perm))])
     print("\nMatriz L:")
     for linha in L:
         print(linha)
@@ -206,15 +1466,20 @@ def ler_sistema():
             raise ValueError("Cada linha deve ter exatamente n elementos.")
         A.append(linha)
 
+    b = ler_vetor_b(n)
+    return A, b
+
+def ler_vetor_b(n):
     print("\nDigite os termos independentes do vetor b:")
     b = list(map(float, input().split()))
     if len(b) != n:
         raise ValueError("O vetor b deve ter exatamente n elementos.")
-    
-    return A, b
+    return b
 
 def main():
     A, b = None, None
+    # Fatorações LU já calculadas para a matriz A atual (reaproveitadas quando só b muda)
+    fatoracoes = {}
 
     while True:
         print("\n=== Resolução de Sistemas Lineares ===")
@@ -223,6 +1488,9 @@ def main():
         print("3 - Resolver com método de Gauss (com pivotação parcial)")
         print("4 - Resolver com decomposição LU (sem pivotação)")
         print("5 - Resolver com decomposição LU (com pivotação parcial)")
+        print("6 - Digitar apenas um novo vetor b (reaproveita a fatoração LU)")
+        print("7 - Resolver com solver de banda (detecção automática da largura de banda)")
+        print("8 - Resolver com Cholesky / LDLᵀ (matrizes simétricas, com detecção automática)")
         print("0 - Sair")
 
         escolha = input("Escolha uma opção: ").strip()
@@ -234,16 +1502,32 @@ def main():
         elif escolha == "1":
             try:
                 A, b = ler_sistema()
+                fatoracoes = {}
                 print("Sistema salvo com sucesso!")
             except ValueError as e:
                 print("Erro:", e)
                 A, b = None, None
+                fatoracoes = {}
+
+        elif escolha == "6":
+            if A is None:
+                print("Nenhum sistema foi digitado ainda. Escolha a opção 1 para inserir um sistema.")
+                continue
+            try:
+                b = ler_vetor_b(len(A))
+                print("Vetor b salvo com sucesso!")
+            except ValueError as e:
+                print("Erro:", e)
 
-        elif escolha in ["2", "3", "4", "5"]:
+        elif escolha in ["2", "3", "4", "5", "7", "8"]:
             if A is None or b is None:
                 print("Nenhum sistema foi digitado ainda. Escolha a opção 1 para inserir um sistema.")
                 continue
             
+            if escolha in ["7", "8"] and np is None:
+                print("Esta opção requer o NumPy (pip install numpy).")
+                continue
+
             # Cria cópias de A e b para evitar modificação do sistema original
             A_copy = [row[:] for row in A]
             b_copy = b[:]
@@ -256,13 +1540,28 @@ def main():
                     solucao = gauss_com_pivotacao(A_copy, b_copy)
                     print("\nSolução (Gauss com pivotação):", solucao)
                 elif escolha == "4":
-                    solucao = resolver_por_LU(A_copy, b_copy)
+                    if np is not None and "LU" not in fatoracoes:
+                        fatoracoes["LU"] = FatoracaoLU(A_copy, pivotacao=False)
+                    solucao = resolver_por_LU(A_copy, b_copy, fatoracoes.get("LU"))
                     print("\nSolução (LU sem pivotação):", solucao)
                 elif escolha == "5":
-                    solucao = resolver_por_LU_pivotacao(A_copy, b_copy)
+                    if np is not None and "LU_pivotacao" not in fatoracoes:
+                        fatoracoes["LU_pivotacao"] = FatoracaoLU(A_copy, pivotacao=True)
+                    solucao = resolver_por_LU_pivotacao(A_copy, b_copy, fatoracao=fatoracoes.get("LU_pivotacao"))
                     print("\nSolução (LU com pivotação parcial):", solucao)
+                elif escolha == "7":
+                    p, q = detectar_largura_banda(A_copy)
+                    print(f"\nLargura de banda detectada: p = {p} (inferior), q = {q} (superior)")
+                    solucao = resolver_sistema_banda(A_copy, b_copy)
+                    print("\nSolução (solver de banda):", solucao)
+                elif escolha == "8":
+                    if "simetrica" not in fatoracoes:
+                        fatoracoes["simetrica"] = fatorar(A_copy)
+                    print("\nFatoração utilizada:", fatoracoes["simetrica"].tipo)
+                    solucao = fatoracoes["simetrica"].resolver(b_copy).tolist()
+                    print("\nSolução (fatoração simétrica):", solucao)
                 
-                # Calcula e exibe o resíduo para as opções 2, 3, 4 e 5
+                # Calcula e exibe o resíduo para as opções 2 a 5, 7 e 8
                 residuo = calcular_residuo(A, b, solucao)
                 print("Resíduo do sistema (b - Ax):", residuo)
 
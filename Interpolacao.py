@@ -1,40 +1,177 @@
 import numpy as np
 import math
-import sympy # <-- Nova importação
+import functools
+from Decomposicao import resolver_tridiagonal
+
+# -------------------------------------------------------------------
+# AVALIAÇÃO EM VÁRIOS PONTOS
+# -------------------------------------------------------------------
+def _pontos_consulta(xi):
+    """
+    Converte xi (número ou sequência de pontos) em array float.
+    Retorna (array, escalar) para que o resultado volte no mesmo formato.
+    """
+    escalar = np.ndim(xi) == 0
+    return np.atleast_1d(np.asarray(xi, dtype=float)), escalar
+
+def _formatar_saida(valores, escalar):
+    return float(valores[0]) if escalar else valores
 
 # -------------------------------------------------------------------
 # MÉTODO 1: INTERPOLAÇÃO DE LAGRANGE
 # -------------------------------------------------------------------
-def interpolacao_lagrange(x, y, xi):
+def interpolacao_lagrange(x, y, xi, elementos_por_bloco=2**20):
     """
     Calcula a interpolação de Lagrange para um dado conjunto de pontos.
+    xi pode ser um número ou um array de pontos: os denominadores de cada L_i
+    são calculados uma única vez e os produtos (xi - x_j), j != i, vêm de
+    produtos acumulados à esquerda e à direita, sem divisões por (xi - x_i).
+    Os pontos são processados em blocos de cerca de elementos_por_bloco
+    pares (ponto, nó), o que limita a memória temporária.
     """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    pontos, escalar = _pontos_consulta(xi)
     n = len(x)
-    yi = 0.0
-    for i in range(n):
-        L_i = 1.0
-        for j in range(n):
-            if i != j:
-                L_i *= (xi - x[j]) / (x[i] - x[j])
-        yi += y[i] * L_i
-    return yi
+
+    diferencas_nos = x[:, None] - x[None, :]
+    np.fill_diagonal(diferencas_nos, 1.0)
+    denominadores = np.prod(diferencas_nos, axis=1)
+
+    resultado = np.empty_like(pontos)
+    pontos_por_bloco = max(1, elementos_por_bloco // n)
+    for inicio in range(0, len(pontos), pontos_por_bloco):
+        bloco = pontos[inicio:inicio + pontos_por_bloco]
+        diferencas = bloco[:, None] - x[None, :]
+        esquerda = np.ones((len(bloco), n))
+        direita = np.ones((len(bloco), n))
+        esquerda[:, 1:] = np.cumprod(diferencas[:, :-1], axis=1)
+        direita[:, :-1] = np.cumprod(diferencas[:, :0:-1], axis=1)[:, ::-1]
+        esquerda *= direita
+        esquerda /= denominadores
+        resultado[inicio:inicio + pontos_por_bloco] = esquerda @ y
+
+    return _formatar_saida(resultado, escalar)
+
+class InterpoladorBaricentrico:
+    """
+    Interpolador de Lagrange na forma baricêntrica.
+
+    Os pesos w_j = 1 / Π_{k != j} (x_j - x_k) são calculados uma única vez
+    (O(n²)); cada avaliação custa O(n) e usa a segunda forma baricêntrica,
+    numericamente estável:
+        P(xi) = Σ w_j y_j / (xi - x_j)  /  Σ w_j / (xi - x_j)
+    adicionar_ponto() atualiza os pesos em O(n). Pontos de consulta que
+    coincidem com um nó retornam o y correspondente.
+    """
+
+    def __init__(self, x, y):
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        if len(self.x) != len(self.y) or len(self.x) == 0:
+            raise ValueError("As listas de x e y devem ter o mesmo número (não nulo) de pontos.")
+        if len(np.unique(self.x)) != len(self.x):
+            raise ValueError("Os valores de x devem ser distintos.")
+        # Diferenças multiplicadas por 4/(max - min) (capacidade do intervalo)
+        # e produtos em logaritmos: os pesos não estouram nem zeram para n grande
+        amplitude = np.ptp(self.x)
+        self.escala = 4.0 / amplitude if amplitude > 0 else 1.0
+        diferencas = self.escala * (self.x[:, None] - self.x[None, :])
+        np.fill_diagonal(diferencas, 1.0)
+        log_pesos = -np.sum(np.log(np.abs(diferencas)), axis=1)
+        sinais = np.prod(np.sign(diferencas), axis=1)
+        # Os pesos valem a menos de um fator comum, que se cancela na fórmula
+        self.log_fator = np.max(log_pesos)
+        self.pesos = sinais * np.exp(log_pesos - self.log_fator)
+
+    def adicionar_ponto(self, x_novo, y_novo):
+        """Acrescenta o nó (x_novo, y_novo) atualizando os pesos em O(n)"""
+        diferencas = self.escala * (self.x - x_novo)
+        if np.any(diferencas == 0):
+            raise ValueError("Os valores de x devem ser distintos.")
+        log_novo = -np.sum(np.log(np.abs(diferencas))) - self.log_fator
+        peso_novo = np.prod(np.sign(-diferencas)) * np.exp(log_novo)
+        pesos = np.append(self.pesos / diferencas, peso_novo)
+        maior = np.max(np.abs(pesos))
+        self.pesos = pesos / maior
+        self.log_fator += np.log(maior)
+        self.x = np.append(self.x, x_novo)
+        self.y = np.append(self.y, y_novo)
+
+    def avaliar(self, xi, pontos_por_bloco=65536):
+        """Avalia o polinômio em xi (número ou array), em blocos de pontos"""
+        pontos, escalar = _pontos_consulta(xi)
+        resultado = np.empty_like(pontos)
+        for inicio in range(0, len(pontos), pontos_por_bloco):
+            bloco = pontos[inicio:inicio + pontos_por_bloco]
+            diferencas = bloco[:, None] - self.x[None, :]
+            no_exato = diferencas == 0
+            diferencas[no_exato] = 1.0
+            termos = self.pesos / diferencas
+            valores = (termos @ self.y) / termos.sum(axis=1)
+            linhas_exatas = np.any(no_exato, axis=1)
+            valores[linhas_exatas] = self.y[np.argmax(no_exato[linhas_exatas], axis=1)]
+            resultado[inicio:inicio + pontos_por_bloco] = valores
+        return _formatar_saida(resultado, escalar)
+
+    __call__ = avaliar
 
 # -------------------------------------------------------------------
 # MÉTODO 2: MÉTODO PRÁTICO (SISTEMA LINEAR)
 # -------------------------------------------------------------------
+def resolver_vandermonde(x, y):
+    """
+    Resolve o sistema de Vandermonde V a = y (V[i][j] = x_i^j) pelo
+    algoritmo de Björck-Pereyra, em O(n²) operações e O(n) memória, sem
+    montar a matriz V. Primeiro calcula as diferenças divididas (forma de
+    Newton) e depois as converte para os coeficientes na base de monômios.
+
+    y pode ser um vetor (n) ou uma matriz (n x k) com k conjuntos de valores
+    sobre os mesmos nós; nesse caso retorna uma matriz n x k de coeficientes.
+    """
+    x = np.asarray(x, dtype=float)
+    a = np.array(y, dtype=float)
+    n = len(x)
+    if a.shape[0] != n:
+        raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+    if len(np.unique(x)) != n:
+        raise ValueError("Os valores de x devem ser distintos.")
+    nos = x if a.ndim == 1 else x[:, None]
+
+    for k in range(n - 1):
+        a[k + 1:] = (a[k + 1:] - a[k:-1]) / (nos[k + 1:] - nos[:n - k - 1])
+    for k in range(n - 2, -1, -1):
+        a[k:n - 1] -= x[k] * a[k + 1:n]
+    return a
+
+def avaliar_polinomio_horner(coeffs, xi):
+    """
+    Avalia P(x) = a0 + a1*x + ... pelo método de Horner em xi (número ou
+    array). coeffs pode ser uma matriz n x k (vários polinômios); nesse caso
+    o resultado tem uma coluna por polinômio.
+    """
+    coeffs = np.asarray(coeffs, dtype=float)
+    pontos, escalar = _pontos_consulta(xi)
+    if coeffs.ndim > 1:
+        pontos = pontos[:, None]
+    yi = np.zeros(np.broadcast_shapes(pontos.shape, coeffs.shape[1:])) + coeffs[-1]
+    for i in range(len(coeffs) - 2, -1, -1):
+        yi = yi * pontos + coeffs[i]
+    return yi[0] if escalar else yi
+
 def metodo_pratico(x, y, xi):
     """
     Calcula a interpolação resolvendo o sistema linear para encontrar
     os coeficientes do polinômio P(x) = a0 + a1*x + a2*x^2 + ...
+    O sistema de Vandermonde é resolvido por Björck-Pereyra e o polinômio
+    avaliado por Horner; xi pode ser um número ou um array de pontos.
     """
-    n = len(x)
-    A = np.vander(x, n, increasing=True)
     try:
-        coeffs = np.linalg.solve(A, y)
-    except np.linalg.LinAlgError:
+        coeffs = resolver_vandermonde(x, y)
+    except ValueError:
         return "Não foi possível resolver. A matriz é singular."
-    yi = sum(coeffs[i] * (xi ** i) for i in range(n))
-    return yi
+    resultado = avaliar_polinomio_horner(coeffs, xi)
+    return float(resultado) if np.ndim(xi) == 0 else resultado
 
 # -------------------------------------------------------------------
 # MÉTODO 3: NEWTON (DIFERENÇAS DIVIDIDAS - GERAL)
@@ -43,47 +180,431 @@ def interpolacao_newton(x, y, xi):
     """
     Calcula a interpolação usando o método de Newton com diferenças divididas.
     Esta é a forma GERAL, que funciona para pontos com espaçamento IGUAL ou DESIGUAL.
+    xi pode ser um número ou um array de pontos (Horner aninhado vetorizado).
     """
+    x = np.asarray(x, dtype=float)
     n = len(x)
-    coef = np.copy(y).astype(float)
+    coef = np.array(y, dtype=float)
     for j in range(1, n):
-        for i in range(n - 1, j - 1, -1):
-            coef[i] = (coef[i] - coef[i-1]) / (x[i] - x[i-j])
-    yi = coef[n-1]
+        coef[j:] = (coef[j:] - coef[j - 1:-1]) / (x[j:] - x[:n - j])
+    pontos, escalar = _pontos_consulta(xi)
+    yi = np.full_like(pontos, coef[n - 1])
     for i in range(n - 2, -1, -1):
-        yi = yi * (xi - x[i]) + coef[i]
-    return yi
+        yi = yi * (pontos - x[i]) + coef[i]
+    return _formatar_saida(yi, escalar)
+
+class InterpoladorNewton:
+    """
+    Interpolador de Newton incremental (diferenças divididas).
+
+    Guarda apenas as duas diagonais da tabela de diferenças divididas:
+    coef[k] = f[x_0, ..., x_k] (coeficientes de Newton) e
+    diagonal_inferior[k] = f[x_{m-1-k}, ..., x_{m-1}] (última linha da tabela).
+    adicionar_ponto() e remover_mais_antigo() custam O(n) cada, sem
+    reconstruir a tabela, o que serve para dados em fluxo e janelas
+    deslizantes (janela = número máximo de pontos mantidos).
+
+    A fórmula de remoção propaga o erro de arredondamento dos coeficientes
+    mais altos para os mais baixos; por isso, a cada n remoções a tabela é
+    refeita a partir dos pontos da janela (O(n²) a cada n remoções, ainda
+    O(n) amortizado por atualização).
+    """
+
+    def __init__(self, x=(), y=(), janela=None):
+        self.janela = janela
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.coef = np.zeros(0)
+        self.diagonal_inferior = np.zeros(0)
+        self.remocoes = 0
+        for xk, yk in zip(x, y):
+            self.adicionar_ponto(xk, yk)
+
+    def __len__(self):
+        return len(self.x)
+
+    def adicionar_ponto(self, x_novo, y_novo):
+        """Acrescenta (x_novo, y_novo) ao final, em O(n)"""
+        x_novo = float(x_novo)
+        if np.any(self.x == x_novo):
+            raise ValueError("Os valores de x devem ser distintos.")
+        m = len(self.x)
+        nova_diagonal = np.empty(m + 1)
+        nova_diagonal[0] = y_novo
+        for k in range(1, m + 1):
+            nova_diagonal[k] = ((nova_diagonal[k - 1] - self.diagonal_inferior[k - 1])
+                                / (x_novo - self.x[m - k]))
+        self.x = np.append(self.x, x_novo)
+        self.y = np.append(self.y, float(y_novo))
+        self.coef = np.append(self.coef, nova_diagonal[m])
+        self.diagonal_inferior = nova_diagonal
+        if self.janela is not None and len(self.x) > self.janela:
+            self.remover_mais_antigo()
+
+    def adicionar_pontos(self, x, y):
+        for xk, yk in zip(x, y):
+            self.adicionar_ponto(xk, yk)
+
+    def remover_mais_antigo(self):
+        """
+        Remove o ponto mais antigo (x_0) em O(n), usando
+        f[x_1, ..., x_{k+1}] = f[x_0, ..., x_k] + (x_{k+1} - x_0) f[x_0, ..., x_{k+1}].
+        """
+        if len(self.x) == 0:
+            raise ValueError("Não há pontos para remover.")
+        self.coef = self.coef[:-1] + (self.x[1:] - self.x[0]) * self.coef[1:]
+        self.diagonal_inferior = self.diagonal_inferior[:-1]
+        self.x = self.x[1:]
+        self.y = self.y[1:]
+        self.remocoes += 1
+        if self.remocoes >= len(self.x):
+            self._reconstruir()
+
+    def _reconstruir(self):
+        """Refaz coef e diagonal_inferior da tabela completa dos pontos atuais, O(n²)"""
+        n = len(self.x)
+        self.remocoes = 0
+        if n == 0:
+            return
+        coluna = self.y.copy()
+        self.coef = np.empty(n)
+        self.diagonal_inferior = np.empty(n)
+        self.coef[0] = coluna[0]
+        self.diagonal_inferior[0] = coluna[-1]
+        for k in range(1, n):
+            # coluna[i] = f[x_i, ..., x_{i+k}], i = 0, ..., n-1-k
+            coluna = (coluna[1:] - coluna[:-1]) / (self.x[k:] - self.x[:n - k])
+            self.coef[k] = coluna[0]
+            self.diagonal_inferior[k] = coluna[-1]
+
+    def avaliar(self, xi):
+        """Avalia o polinômio em xi (número ou array) pelo Horner aninhado"""
+        n = len(self.x)
+        if n == 0:
+            raise ValueError("O interpolador não tem pontos.")
+        pontos, escalar = _pontos_consulta(xi)
+        yi = np.full_like(pontos, self.coef[n - 1])
+        for i in range(n - 2, -1, -1):
+            yi = yi * (pontos - self.x[i]) + self.coef[i]
+        return _formatar_saida(yi, escalar)
+
+    __call__ = avaliar
 
 # -------------------------------------------------------------------
 # MÉTODO 4: GREGORY-NEWTON (DIFERENÇAS FINITAS - PONTOS IGUALMENTE ESPAÇADOS)
 # -------------------------------------------------------------------
+@functools.lru_cache(maxsize=32)
+def _diferencas_topo_em_cache(y_bytes):
+    y = np.frombuffer(y_bytes, dtype=float)
+    n = len(y)
+    topo = np.empty(n)
+    buffer = y.copy()
+    topo[0] = buffer[0]
+    for j in range(1, n):
+        # Diferenças de ordem j sobrescrevem as de ordem j-1 no mesmo buffer
+        buffer[:n - j] = buffer[1:n - j + 1] - buffer[:n - j]
+        topo[j] = buffer[0]
+    topo.flags.writeable = False
+    return topo
+
+def diferencas_finitas_topo(y):
+    """
+    Retorna a linha do topo da tabela de diferenças finitas
+    [y_0, Δy_0, Δ²y_0, ..., Δ^(n-1) y_0] usando um único buffer de tamanho n
+    (memória O(n)) em vez da tabela n x n. O resultado fica em cache para
+    consultas repetidas com os mesmos y.
+    """
+    return _diferencas_topo_em_cache(np.ascontiguousarray(y, dtype=float).tobytes())
+
 def gregory_newton_finitas(x, y, xi):
     """
     Calcula a interpolação usando a fórmula de Gregory-Newton para diferenças finitas.
     Este é o caso ESPECIAL, que funciona APENAS para pontos x IGUALMENTE espaçados.
+    xi pode ser um número ou um array de pontos.
     """
     n = len(x)
     if n < 2:
         return y[0] if n == 1 else "Erro: precisa de pelo menos 2 pontos."
+    x = np.asarray(x, dtype=float)
     h = x[1] - x[0]
-    for i in range(1, n - 1):
-        if not np.isclose(x[i+1] - x[i], h):
-            return (f"Erro: Os pontos x não são igualmente espaçados. "
-                    f"Use o método de Newton (Diferenças Divididas).")
-    delta_y = np.zeros((n, n))
-    delta_y[:, 0] = y
-    for j in range(1, n):
-        for i in range(n - j):
-            delta_y[i, j] = delta_y[i+1, j-1] - delta_y[i, j-1]
-    diferencas_topo = delta_y[0]
-    s = (xi - x[0]) / h
-    yi = diferencas_topo[0]
-    termo_s = 1.0
+    if not np.all(np.isclose(np.diff(x)[1:], h)):
+        return (f"Erro: Os pontos x não são igualmente espaçados. "
+                f"Use o método de Newton (Diferenças Divididas).")
+    diferencas_topo = diferencas_finitas_topo(y)
+    pontos, escalar = _pontos_consulta(xi)
+    s = (pontos - x[0]) / h
+    yi = np.full_like(pontos, diferencas_topo[0])
+    # termo_s acumula s(s-1)...(s-i+1) / i!, sem calcular o fatorial a cada termo
+    termo_s = np.ones_like(pontos)
     for i in range(1, n):
-        termo_s *= (s - (i - 1))
-        termo_adicional = (termo_s * diferencas_topo[i]) / math.factorial(i)
-        yi += termo_adicional
-    return yi
+        termo_s *= (s - (i - 1)) / i
+        yi += termo_s * diferencas_topo[i]
+    return _formatar_saida(yi, escalar)
+
+# -------------------------------------------------------------------
+# INTERPOLAÇÃO LOCAL EM TABELAS GRANDES
+# -------------------------------------------------------------------
+class InterpoladorTabela:
+    """
+    Interpolação local (por janelas) sobre tabelas com muitos pontos.
+
+    Em vez de um único polinômio global, cada consulta usa o polinômio de
+    grau `grau` que passa pelos grau + 1 pontos mais próximos. A tabela é
+    mantida ordenada por x; o intervalo de cada consulta é encontrado por
+    bisseção (np.searchsorted) ou, se a malha for igualmente espaçada, em
+    O(1) por divisão por h. As colunas de diferenças (finitas na malha
+    uniforme, usadas na fórmula de Gregory-Newton; divididas caso contrário,
+    usadas na de Newton) são calculadas uma vez na construção, o que permite
+    avaliar milhões de consultas de forma vetorizada.
+    """
+
+    def __init__(self, x, y, grau=3):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) != len(y):
+            raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+        if not 0 <= grau < len(x):
+            raise ValueError("O grau deve ser menor que o número de pontos.")
+        ordem = np.argsort(x, kind="stable")
+        self.x, self.y = x[ordem], y[ordem]
+        passos = np.diff(self.x)
+        if np.any(passos == 0):
+            raise ValueError("Os valores de x devem ser distintos.")
+        self.grau = grau
+        self.h = (self.x[-1] - self.x[0]) / len(passos) if len(passos) else 1.0
+        # Uniforme se os passos só diferem de h pelo arredondamento dos próprios
+        # x (alguns eps da maior magnitude), qualquer que seja a escala de x
+        tolerancia = 8 * np.finfo(float).eps * np.max(np.abs(self.x))
+        self.uniforme = bool(np.all(np.abs(passos - self.h) <= tolerancia))
+
+        # colunas[k][i] = Δ^k y_i (uniforme) ou f[x_i, ..., x_{i+k}] (geral)
+        self.colunas = [self.y]
+        for k in range(1, grau + 1):
+            diferenca = np.diff(self.colunas[-1])
+            if not self.uniforme:
+                diferenca = diferenca / (self.x[k:] - self.x[:-k])
+            self.colunas.append(diferenca)
+
+    def _inicio_janela(self, pontos):
+        """
+        Índice do primeiro ponto da janela de grau + 1 pontos de cada consulta:
+        com número par de pontos (grau ímpar) a janela fica centrada no
+        intervalo [x_i, x_{i+1}] que contém a consulta; com número ímpar
+        (grau par, inclusive 0) fica centrada no nó mais próximo.
+        """
+        n = len(self.x)
+        if self.uniforme:
+            posicao = (pontos - self.x[0]) / self.h
+            intervalo = np.floor(posicao).astype(np.int64)
+            mais_proximo = np.floor(posicao + 0.5).astype(np.int64)
+        else:
+            intervalo = np.clip(np.searchsorted(self.x, pontos, side="right") - 1, 0, max(n - 2, 0))
+            direita = np.minimum(intervalo + 1, n - 1)
+            mais_proximo = np.where(pontos - self.x[intervalo] >= self.x[direita] - pontos,
+                                    direita, intervalo)
+        if self.grau % 2:
+            inicio = intervalo - (self.grau - 1) // 2
+        else:
+            inicio = mais_proximo - self.grau // 2
+        return np.clip(inicio, 0, n - 1 - self.grau)
+
+    def avaliar(self, xi):
+        """Avalia a interpolação local em xi (número ou array)"""
+        pontos, escalar = _pontos_consulta(xi)
+        i0 = self._inicio_janela(pontos)
+        yi = self.colunas[0][i0].copy()
+        if self.uniforme:
+            # Gregory-Newton: Σ Δ^k y_i0 * s(s-1)...(s-k+1) / k!
+            s = (pontos - self.x[i0]) / self.h
+            termo = np.ones_like(pontos)
+            for k in range(1, self.grau + 1):
+                termo *= (s - (k - 1)) / k
+                yi += termo * self.colunas[k][i0]
+        else:
+            # Newton: Σ f[x_i0, ..., x_i0+k] * Π_{j<k} (xi - x_{i0+j})
+            produto = np.ones_like(pontos)
+            for k in range(1, self.grau + 1):
+                produto *= pontos - self.x[i0 + k - 1]
+                yi += produto * self.colunas[k][i0]
+        return _formatar_saida(yi, escalar)
+
+    __call__ = avaliar
+
+# -------------------------------------------------------------------
+# SPLINE CÚBICA
+# -------------------------------------------------------------------
+class SplineCubica:
+    """
+    Spline cúbica interpoladora: um polinômio de grau 3 por intervalo, com
+    primeira e segunda derivadas contínuas.
+
+    tipo="natural": segunda derivada nula nos extremos;
+    tipo="fixada": primeira derivada dada nos extremos (derivadas=(d0, dn));
+    tipo="not-a-knot": terceira derivada contínua em x_1 e x_{n-2}.
+
+    As segundas derivadas M_i vêm de um sistema tridiagonal resolvido em O(n)
+    (Decomposicao.resolver_tridiagonal). A avaliação localiza o intervalo de
+    cada ponto por bisseção (np.searchsorted) e usa Horner, vetorizada sobre
+    arrays grandes de consulta.
+    """
+
+    def __init__(self, x, y, tipo="natural", derivadas=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) != len(y):
+            raise ValueError("As listas de x e y devem ter o mesmo número de pontos.")
+        if len(x) < 2:
+            raise ValueError("A spline precisa de pelo menos 2 pontos.")
+        if tipo not in ("natural", "fixada", "not-a-knot"):
+            raise ValueError(f"Tipo de spline desconhecido: {tipo}")
+        if tipo == "fixada" and derivadas is None:
+            raise ValueError("A spline fixada precisa das derivadas nos extremos.")
+        ordem = np.argsort(x, kind="stable")
+        self.x, self.y = x[ordem], y[ordem]
+        h = np.diff(self.x)
+        if np.any(h == 0):
+            raise ValueError("Os valores de x devem ser distintos.")
+        self.tipo = tipo
+
+        M = self._segundas_derivadas(h, tipo, derivadas)
+        inclinacao = np.diff(self.y) / h
+        self.a = self.y[:-1]
+        self.b = inclinacao - h * (2 * M[:-1] + M[1:]) / 6
+        self.c = M[:-1] / 2
+        self.d = np.diff(M) / (6 * h)
+
+    def _segundas_derivadas(self, h, tipo, derivadas):
+        n = len(self.x)
+        inclinacao = np.diff(self.y) / h
+        if n == 2 and tipo != "fixada":
+            return np.zeros(2)
+        if n == 3 and tipo == "not-a-knot":
+            # Com três pontos a spline not-a-knot é a própria parábola interpoladora
+            return np.full(3, 2 * (inclinacao[1] - inclinacao[0]) / (h[0] + h[1]))
+
+        inferior = np.zeros(n - 1)
+        principal = np.ones(n)
+        superior = np.zeros(n - 1)
+        lado_direito = np.zeros(n)
+
+        # Linhas internas: h_{i-1} M_{i-1} + 2(h_{i-1} + h_i) M_i + h_i M_{i+1} = r_i
+        inferior[:-1] = h[:-1]
+        principal[1:-1] = 2 * (h[:-1] + h[1:])
+        superior[1:] = h[1:]
+        lado_direito[1:-1] = 6 * np.diff(inclinacao)
+
+        if tipo == "fixada":
+            d0, dn = derivadas
+            principal[0], superior[0] = 2 * h[0], h[0]
+            lado_direito[0] = 6 * (inclinacao[0] - d0)
+            inferior[-1], principal[-1] = h[-1], 2 * h[-1]
+            lado_direito[-1] = 6 * (dn - inclinacao[-1])
+        elif tipo == "not-a-knot":
+            # M_0 = ((h_0 + h_1) M_1 - h_0 M_2) / h_1 (terceira derivada contínua em
+            # x_1) é substituído na primeira linha interna, e o análogo na última;
+            # resolve-se o sistema tridiagonal reduzido para M_1, ..., M_{n-2}
+            h0, h1, hp, hq = h[0], h[1], h[-2], h[-1]
+            principal[1] = (h0 + h1) * (h0 + 2 * h1) / h1
+            superior[1] = (h1**2 - h0**2) / h1
+            inferior[-2] = (hp**2 - hq**2) / hp
+            principal[-2] = (hp + hq) * (2 * hp + hq) / hp
+            M = np.empty(n)
+            M[1:-1] = resolver_tridiagonal(inferior[1:-1], principal[1:-1], superior[1:-1],
+                                           lado_direito[1:-1])
+            M[0] = ((h0 + h1) * M[1] - h0 * M[2]) / h1
+            M[-1] = ((hp + hq) * M[-2] - hq * M[-3]) / hp
+            return M
+
+        return resolver_tridiagonal(inferior, principal, superior, lado_direito)
+
+    def avaliar(self, xi):
+        """Avalia a spline em xi (número ou array); fora de [x_0, x_n] extrapola"""
+        pontos, escalar = _pontos_consulta(xi)
+        i = np.clip(np.searchsorted(self.x, pontos, side="right") - 1, 0, len(self.x) - 2)
+        t = pontos - self.x[i]
+        yi = self.a[i] + t * (self.b[i] + t * (self.c[i] + t * self.d[i]))
+        return _formatar_saida(yi, escalar)
+
+    __call__ = avaliar
+
+# -------------------------------------------------------------------
+# INTERPOLAÇÃO DE CHEBYSHEV
+# -------------------------------------------------------------------
+def nos_chebyshev(a, b, n):
+    """
+    Retorna os n nós de Chebyshev (raízes de T_n) mapeados para [a, b],
+    na ordem x_k = (a+b)/2 + (b-a)/2 * cos(π(k + 1/2)/n), k = 0..n-1
+    (decrescente), que é a ordem esperada por coeficientes_chebyshev.
+    """
+    k = np.arange(n)
+    return (a + b) / 2 + (b - a) / 2 * np.cos(np.pi * (k + 0.5) / n)
+
+def coeficientes_chebyshev(y):
+    """
+    Coeficientes c_j de P(t) = Σ c_j T_j(t) que interpola os valores y nos nós
+    de nos_chebyshev. É uma DCT-II, calculada com uma FFT de tamanho 2n em
+    O(n log n).
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    espectro = np.fft.fft(np.concatenate((y, y[::-1])))[:n]
+    c = np.real(espectro * np.exp(-1j * np.pi * np.arange(n) / (2 * n))) / n
+    c[0] /= 2
+    return c
+
+def clenshaw(c, t):
+    """Avalia Σ c_j T_j(t) pela recorrência de Clenshaw (t em [-1, 1], array)"""
+    b1 = np.zeros_like(t)
+    b2 = np.zeros_like(t)
+    for cj in c[:0:-1]:
+        b1, b2 = cj + 2 * t * b1 - b2, b1
+    return c[0] + t * b1 - b2
+
+class InterpoladorChebyshev:
+    """
+    Interpolação de uma função f em [a, b] nos nós de Chebyshev, estável
+    mesmo em grau alto (ao contrário dos nós igualmente espaçados).
+
+    Com n informado usa n nós; com n=None escolhe o grau adaptativamente,
+    dobrando o número de nós até que os últimos coeficientes fiquem abaixo
+    de tolerancia * max|c_j|, e descarta a cauda desprezível. A avaliação
+    em lote usa a recorrência de Clenshaw.
+    """
+
+    def __init__(self, f, a, b, n=None, tolerancia=1e-13, n_max=2**16):
+        if not a < b:
+            raise ValueError("O intervalo [a, b] deve ter a < b.")
+        self.a, self.b = float(a), float(b)
+        if n is not None:
+            if n < 1:
+                raise ValueError("O número de nós deve ser pelo menos 1.")
+            self.coef = coeficientes_chebyshev(f(nos_chebyshev(a, b, n)))
+            self.convergiu = None
+            return
+
+        n = 17
+        while True:
+            c = coeficientes_chebyshev(f(nos_chebyshev(a, b, n)))
+            escala = np.max(np.abs(c)) or 1.0
+            cauda = np.abs(c[-max(4, n // 16):])
+            if np.max(cauda) <= tolerancia * escala or 2 * n > n_max:
+                break
+            n *= 2
+        self.convergiu = bool(np.max(cauda) <= tolerancia * escala)
+        significativos = np.nonzero(np.abs(c) > tolerancia * escala)[0]
+        self.coef = c[:significativos[-1] + 1] if significativos.size else c[:1]
+
+    @property
+    def grau(self):
+        return len(self.coef) - 1
+
+    def avaliar(self, xi):
+        """Avalia o interpolador em xi (número ou array)"""
+        pontos, escalar = _pontos_consulta(xi)
+        t = (2 * pontos - self.a - self.b) / (self.b - self.a)
+        return _formatar_saida(clenshaw(self.coef, t), escalar)
+
+    __call__ = avaliar
 
 # -------------------------------------------------------------------
 # FUNÇÕES AUXILIARES
@@ -106,11 +627,79 @@ def obter_dados():
 # -------------------------------------------------------------------
 # FUNÇÃO DE ERRO (MODIFICADA COM CÁLCULO AUTOMÁTICO DE M)
 # -------------------------------------------------------------------
+@functools.lru_cache(maxsize=128)
+def derivada_compilada(f_str, ordem):
+    """
+    Retorna (f_sym, derivada_sym, derivada_num) para a derivada de ordem
+    `ordem` de f(x). O resultado fica em cache por (expressão, ordem), de modo
+    que sympify, diff e lambdify rodam uma única vez para cada par.
+    """
+    import sympy  # Importado só quando necessário: carregar o SymPy é caro
+
+    x_sym = sympy.symbols('x')
+    f_sym = sympy.sympify(f_str)
+    derivada = sympy.diff(f_sym, x_sym, ordem)
+    f_num = sympy.lambdify(x_sym, derivada, 'numpy')
+    # lambdify de uma constante devolve um escalar: garante um array do tamanho da entrada
+    derivada_num = lambda t: np.broadcast_to(np.asarray(f_num(t), dtype=float), np.shape(t))
+    return f_sym, derivada, derivada_num
+
+def maximo_abs_adaptativo(f, a, b, amostras=64, candidatos=4, iteracoes=60):
+    """
+    Estima max |f(t)| em [a, b]: amostra grosseira com `amostras` pontos e
+    refinamento local (busca da seção áurea, vetorizada) em torno dos
+    `candidatos` melhores pontos da amostra.
+    """
+    if a == b:
+        return float(np.abs(f(np.array([a])))[0])
+    t = np.linspace(a, b, amostras)
+    valores = np.abs(f(t))
+    melhores = np.argsort(valores)[-candidatos:]
+    M = float(np.max(valores))
+
+    esquerda = t[np.maximum(melhores - 1, 0)]
+    direita = t[np.minimum(melhores + 1, amostras - 1)]
+    razao = (np.sqrt(5) - 1) / 2
+    for _ in range(iteracoes):
+        c = direita - razao * (direita - esquerda)
+        d = esquerda + razao * (direita - esquerda)
+        fc, fd = np.abs(f(c)), np.abs(f(d))
+        M = max(M, float(np.max(fc)), float(np.max(fd)))
+        maior_em_c = fc > fd
+        direita = np.where(maior_em_c, d, direita)
+        esquerda = np.where(maior_em_c, esquerda, c)
+    return M
+
+def limite_erro_truncamento(f_str, x, xi):
+    """
+    Calcula (sem interação) o limite do erro de truncamento
+        |E(xi)| <= M / (n+1)! * |Π (xi - x_j)|
+    em que M = max |f^(n+1)| no intervalo que contém x e xi.
+    Retorna (limite, M, produtorio, fatorial); xi pode ser um array.
+    """
+    x = np.asarray(x, dtype=float)
+    n_plus_1 = len(x)
+    _, _, f_deriv_num = derivada_compilada(f_str, n_plus_1)
+    todos_os_pontos_x = np.append(x, xi)
+    M = maximo_abs_adaptativo(f_deriv_num, np.min(todos_os_pontos_x), np.max(todos_os_pontos_x))
+    produtorio = np.prod(np.subtract.outer(np.asarray(xi, dtype=float), x), axis=-1)
+    fatorial_n_mais_1 = math.factorial(n_plus_1)
+    return (M / fatorial_n_mais_1) * np.abs(produtorio), M, produtorio, fatorial_n_mais_1
+
+def limites_erro_truncamento(f_str, casos):
+    """
+    Versão em lote: casos é uma sequência de pares (x, xi). Retorna a lista
+    com o limite do erro de cada par, reaproveitando as derivadas em cache.
+    """
+    return [limite_erro_truncamento(f_str, x, xi)[0] for x, xi in casos]
+
 def calcular_limite_erro_truncamento(x, xi):
     """
     Calcula o limite teórico do erro de truncamento, calculando M
     automaticamente a partir da função f(x) fornecida.
     """
+    import sympy
+
     print("\n--- Cálculo do Limite do Erro de Truncamento ---")
     
     # n é o grau do polinômio, que é o número de pontos - 1
@@ -120,36 +709,14 @@ def calcular_limite_erro_truncamento(x, xi):
         # 1. Obter a função do usuário
         f_str = input("Digite a função f(x) (ex: '2*x**4 + 3*x**2 + 1'): ")
         
-        # 2. Configurar o SymPy
-        x_sym = sympy.symbols('x')
-        f_sym = sympy.sympify(f_str)
-        
-        # 3. Calcular a derivada (n+1)-ésima
+        # 2. Derivada (n+1)-ésima simbólica e numérica (em cache por função e ordem)
         n_plus_1 = n + 1
-        derivada_n_plus_1 = sympy.diff(f_sym, x_sym, n_plus_1)
-        
-        # 4. Converter a derivada simbólica em uma função numérica
-        #    Isso é muito mais rápido para a avaliação
-        f_deriv_num = sympy.lambdify(x_sym, derivada_n_plus_1, 'numpy')
-        
-        # 5. Encontrar o intervalo de busca para M
-        #    O intervalo deve conter todos os pontos x e também xi
-        todos_os_pontos_x = np.append(x, xi)
-        intervalo_min = np.min(todos_os_pontos_x)
-        intervalo_max = np.max(todos_os_pontos_x)
+        f_sym, derivada_n_plus_1, _ = derivada_compilada(f_str, n_plus_1)
         
-        # 6. Encontrar M (valor máximo) numericamente
-        #    Amostramos a derivada em alta resolução (2000 pontos)
-        x_amostra = np.linspace(intervalo_min, intervalo_max, 2000)
-        valores_derivada = f_deriv_num(x_amostra)
-        M = np.max(np.abs(valores_derivada))
-        
-        # 7. Calcular os outros termos da fórmula do erro
-        produtorio = np.prod([(xi - val_x) for val_x in x])
-        fatorial_n_mais_1 = math.factorial(n_plus_1)
-        
-        # 8. Calcular o limite do erro
-        limite_erro = (M / fatorial_n_mais_1) * abs(produtorio)
+        # 3. M por amostragem grosseira + refinamento local, e a fórmula do erro
+        limite_erro, M, produtorio, fatorial_n_mais_1 = limite_erro_truncamento(f_str, x, xi)
+        intervalo_min = min(min(x), xi)
+        intervalo_max = max(max(x), xi)
         
         print("\n--- Resultado do Limite do Erro ---")
         print(f"Função f(x): {f_sym}")
@@ -168,6 +735,43 @@ def calcular_limite_erro_truncamento(x, xi):
         print("Verifique se a função digitada está correta e se o número de pontos é adequado.")
 
 
+def interpolar_funcao_chebyshev():
+    """Opção 6 do menu: interpola uma f(x) digitada nos nós de Chebyshev"""
+    import sympy
+
+    try:
+        f_str = input("Digite a função f(x) (ex: 'exp(x)*sin(5*x)'): ")
+        a = float(input("Digite o início do intervalo (a): "))
+        b = float(input("Digite o fim do intervalo (b): "))
+        n_str = input("Número de nós (Enter para escolha automática do grau): ").strip()
+        xi = float(input("Digite o valor de x (xi) a ser interpolado: "))
+        n = int(n_str) if n_str else None
+        if n is not None and n < 1:
+            raise ValueError("O número de nós deve ser pelo menos 1.")
+        _, _, f_num = derivada_compilada(f_str, 0)
+        interpolador = InterpoladorChebyshev(f_num, a, b, n=n)
+        valor_interpolado = interpolador(xi)
+        valor_exato = float(f_num(np.array([xi]))[0])
+    except sympy.SympifyError:
+        print("Erro: A função digitada não é válida. Use a sintaxe do Python (ex: 'x**2' para x²).")
+        return
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    except Exception as e:
+        print(f"Ocorreu um erro inesperado: {e}")
+        print("Verifique se a função digitada está correta (use apenas a variável x).")
+        return
+
+    print("\n--- Resultado ---")
+    print("Método Utilizado: Chebyshev (nós de Chebyshev + Clenshaw)")
+    print(f"Grau do interpolador: {interpolador.grau}")
+    if interpolador.convergiu is False:
+        print("Aviso: os coeficientes não decaíram até a tolerância; o grau foi limitado.")
+    print(f"O valor interpolado em x = {xi} é y = {valor_interpolado:.6f}")
+    print(f"Valor exato f({xi}) = {valor_exato:.6f}")
+
+
 # -------------------------------------------------------------------
 # MENU PRINCIPAL (Sem mudanças aqui)
 # -------------------------------------------------------------------
@@ -178,6 +782,8 @@ def menu():
         print("2. Método Prático (Sistema Linear)")
         print("3. Método de Newton (Diferenças Divididas - Espaçamento qualquer)")
         print("4. Método de Gregory-Newton (Diferenças Finitas - Apenas espaçamento igual)")
+        print("5. Spline Cúbica (natural, fixada ou not-a-knot)")
+        print("6. Interpolação de Chebyshev (escolhe os nós para uma função f(x))")
         print("0. Sair")
         
         escolha = input("Escolha uma opção (ou 0 para sair): ")
@@ -186,9 +792,15 @@ def menu():
             print("Saindo do programa. Até mais!")
             break
         
-        if escolha not in ['1', '2', '3', '4']:
+        if escolha not in ['1', '2', '3', '4', '5', '6']:
             print("Opção inválida. Tente novamente.")
             continue
+
+        if escolha == '6':
+            interpolar_funcao_chebyshev()
+            print("-------------------")
+            input("\nPressione Enter para continuar...")
+            continue
             
         x, y, xi = obter_dados()
         
@@ -199,8 +811,11 @@ def menu():
         metodo_nome = ""
         
         if escolha == '1':
-            resultado = interpolacao_lagrange(x, y, xi)
-            metodo_nome = "Lagrange"
+            try:
+                resultado = InterpoladorBaricentrico(x, y)(xi)
+            except ValueError as e:
+                resultado = f"Erro: {e}"
+            metodo_nome = "Lagrange (forma baricêntrica)"
         elif escolha == '2':
             resultado = metodo_pratico(x, y, xi)
             metodo_nome = "Prático (Sistema Linear)"
@@ -210,6 +825,19 @@ def menu():
         elif escolha == '4':
             resultado = gregory_newton_finitas(x, y, xi)
             metodo_nome = "Gregory-Newton (Diferenças Finitas)"
+        elif escolha == '5':
+            spline = None
+            try:
+                tipo = input("Tipo de spline (natural / fixada / not-a-knot) [natural]: ").strip().lower() or "natural"
+                derivadas = None
+                if tipo == "fixada":
+                    derivadas = (float(input("Derivada f'(x) no primeiro ponto: ")),
+                                 float(input("Derivada f'(x) no último ponto: ")))
+                spline = SplineCubica(x, y, tipo, derivadas)
+                resultado = spline(xi)
+            except ValueError as e:
+                resultado = f"Erro: {e}"
+            metodo_nome = "Spline Cúbica"
             
         print("\n--- Resultado ---")
         print(f"Método Utilizado: {metodo_nome}")
@@ -217,17 +845,24 @@ def menu():
         print(f"Pontos y: {y}")
         
         if isinstance(resultado, str): # Verifica se a função retornou uma string de erro
-            print(f"O valor interpolado em x = {xi} é y = {resultado:.3f}")
-            print(f"Resultado: {resultado:.3f}")
+            print(f"Resultado: {resultado}")
         else:
             print(f"O valor interpolado em x = {xi} é y = {resultado:.3f}")
-            
-            # --- Bloco que chama a função de erro ---
-            print("-------------------") 
-            deseja_erro = input("\nDeseja calcular o limite do erro de truncamento (com cálculo de M)? (s/n): ").strip().lower()
-            if deseja_erro == 's':
-                # Chama a nova função de limite de erro
-                calcular_limite_erro_truncamento(x, xi)
+
+            if escolha == '5':
+                # A spline não é um polinômio global: em vez do limite de erro, oferece o gráfico
+                if input("\nDeseja plotar a spline com os pontos? (s/n): ").strip().lower() == 's':
+                    import Ajustes_de_curvas
+                    Ajustes_de_curvas.plotar_grafico_completo(
+                        np.array(x), np.array(y), spline, f"Spline Cúbica ({spline.tipo})",
+                        rotulo_curva="Spline Cúbica")
+            else:
+                # --- Bloco que chama a função de erro ---
+                print("-------------------") 
+                deseja_erro = input("\nDeseja calcular o limite do erro de truncamento (com cálculo de M)? (s/n): ").strip().lower()
+                if deseja_erro == 's':
+                    # Chama a nova função de limite de erro
+                    calcular_limite_erro_truncamento(x, xi)
         
         print("-------------------")
         input("\nPressione Enter para continuar...")
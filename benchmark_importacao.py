@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+# Módulos do projeto e as bibliotecas pesadas que eles podem carregar
+MODULOS = [
+    "main",
+    "Interpolacao",
+    "Decomposicao",
+    "Ajustes_de_curvas",
+    "Calculadora_de_binarios",
+    "numpy",
+    "sympy",
+    "matplotlib.pyplot",
+]
+
+CODIGO_MEDICAO = (
+    "import time; inicio = time.perf_counter(); import {modulo}; "
+    "print(time.perf_counter() - inicio)"
+)
+
+def medir_importacao(modulo, repeticoes=3):
+    """
+    Mede o tempo de importação de um módulo em um interpretador novo (cache
+    frio de módulos), repetindo a medição e retornando o menor tempo em segundos.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO_MEDICAO.format(modulo=modulo)],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        tempos.append(float(saida.stdout.strip().splitlines()[-1]))
+    return min(tempos)
+
+def main():
+    print("\n--- Custo de importação por módulo (menor de 3 execuções) ---")
+    for modulo in MODULOS:
+        try:
+            tempo = medir_importacao(modulo)
+            print(f"{modulo:<25} {tempo * 1000:10.1f} ms")
+        except subprocess.CalledProcessError:
+            print(f"{modulo:<25} {'não disponível':>13}")
+
+if __name__ == "__main__":
+    main()
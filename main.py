@@ -1,9 +1,6 @@
-# 1. Importa os outros arquivos como módulos
-import Interpolacao
-import Decomposicao
-import Ajustes_de_curvas 
-import Calculadora_de_binarios
- 
+# 1. Os outros arquivos são importados como módulos só quando a opção do
+#    menu é escolhida, para que o menu apareça sem carregar NumPy, SymPy e
+#    Matplotlib (veja benchmark_importacao.py)
 
 def exibir_menu_principal():
     """
@@ -24,21 +21,25 @@ def exibir_menu_principal():
 
         if escolha == '1':
             print("\n...Iniciando Módulo de Interpolação...")
+            import Interpolacao
             Interpolacao.menu() 
             print("\n...Módulo de Interpolação finalizado. Retornando ao menu principal...")
 
         elif escolha == '2':
             print("\n...Iniciando Módulo de Decomposição...")
+            import Decomposicao
             Decomposicao.main() 
             print("\n...Módulo de Decomposição finalizado. Retornando ao menu principal...")
 
         elif escolha == '3':
             print("\n...Iniciando Módulo de Ajuste de Curvas...")
+            import Ajustes_de_curvas
             Ajustes_de_curvas.menu() 
             print("\n...Módulo de Ajuste de Curvas finalizado. Retornando ao menu principal...")
         
         elif escolha == '4':
             print("\n...Iniciando a Calculadora de binarios...")
+            import Calculadora_de_binarios
             Calculadora_de_binarios.main() 
             print("\n...Calculadora de binários finalizada. Retornando ao menu principal...")
 
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from Ajustes_de_curvas import RegressaoJanelaMovel, regressao_janela_movel
+
+
+@pytest.mark.parametrize("grau", [4, 5])
+def test_janela_movel_grau_alto_igual_a_polyfit(grau):
+    """Janela de 200 pontos com x irregular: cada janela bate com np.polyfit"""
+    rng = np.random.default_rng(2)
+    n, janela = 1500, 200
+    x = np.cumsum(rng.uniform(0.005, 0.015, n))
+    y = np.sin(2 * x) + rng.normal(0, 0.01, n)
+
+    coeficientes, R_quadrado = regressao_janela_movel(x, y, janela, grau)
+    fluxo = RegressaoJanelaMovel(janela, grau)
+    assert np.isnan(coeficientes[:janela - 1]).all()
+    for i in range(n):
+        fluxo.adicionar(x[i], y[i])
+        if i < janela - 1:
+            continue
+        xs, ys = x[i - janela + 1:i + 1], y[i - janela + 1:i + 1]
+        esperado = np.polyval(np.polyfit(xs, ys, grau), xs)
+        R2_esperado = 1 - np.sum((ys - esperado)**2) / np.sum((ys - ys.mean())**2)
+
+        np.testing.assert_allclose(np.polyval(coeficientes[i], xs), esperado, rtol=0, atol=1e-8)
+        assert abs(R_quadrado[i] - R2_esperado) < 1e-9
+        polinomio, R2 = fluxo.resultado()
+        assert polinomio is not None
+        np.testing.assert_allclose(polinomio(xs), esperado, rtol=0, atol=1e-8)
+        assert abs(R2 - R2_esperado) < 1e-9
+
+
+def test_janela_movel_sem_x_distintos_suficientes():
+    x = np.repeat([1.0, 2.0, 3.0], 100)
+    y = x**2
+    coeficientes, _ = regressao_janela_movel(x, y, 150, grau=2)
+    # Só as janelas que alcançam os três valores de x determinam a parábola
+    com_tres_valores = np.zeros(len(x), dtype=bool)
+    com_tres_valores[200:249] = True
+    assert np.isnan(coeficientes[149:][~com_tres_valores[149:]]).all()
+    np.testing.assert_allclose(coeficientes[com_tres_valores], [[1.0, 0.0, 0.0]] * 49, atol=1e-9)
+
+    fluxo = RegressaoJanelaMovel(50, grau=4)
+    for xi, yi in zip(x, y):
+        fluxo.adicionar(xi, yi)
+    polinomio, R2 = fluxo.resultado()
+    assert polinomio is None and np.isnan(R2)
@@ -0,0 +1,72 @@
+import builtins
+
+import numpy as np
+import pytest
+
+from Interpolacao import (InterpoladorChebyshev, InterpoladorNewton, InterpoladorTabela,
+                          interpolacao_newton, interpolar_funcao_chebyshev)
+
+
+def test_newton_janela_deslizante_em_fluxo_longo():
+    """Janela de 6 pontos, 10⁴ atualizações sobre x não uniforme: igual a refazer do zero"""
+    rng = np.random.default_rng(0)
+    n, janela = 10_000, 6
+    x = np.cumsum(rng.uniform(0.1, 1.0, n))
+    y = np.sin(x / 3)
+
+    interpolador = InterpoladorNewton(janela=janela)
+    for i in range(n):
+        interpolador.adicionar_ponto(x[i], y[i])
+        if i >= janela - 1 and (i % 97 == 0 or i == n - 1):
+            nos = slice(i - janela + 1, i + 1)
+            consulta = np.linspace(x[nos][0], x[nos][-1], 13)
+            esperado = interpolacao_newton(x[nos], y[nos], consulta)
+            np.testing.assert_allclose(interpolador(consulta), esperado, rtol=0, atol=1e-12)
+
+
+def test_tabela_detecta_malhas_uniformes_grandes():
+    for x in (np.linspace(0, 1, 10**6), np.linspace(1000, 1001, 10**6),
+              np.linspace(-5, 5, 2 * 10**6)):
+        assert InterpoladorTabela(x, x, grau=1).uniforme
+
+    rng = np.random.default_rng(1)
+    com_ruido = np.linspace(0, 1, 101) + rng.normal(0, 1e-6, 101)
+    assert not InterpoladorTabela(com_ruido, com_ruido, grau=1).uniforme
+    pequenos = np.sort(rng.uniform(size=50)) * 1e-6
+    tabela = InterpoladorTabela(pequenos, pequenos * 1e6, grau=1)
+    assert not tabela.uniforme
+    meio = (pequenos[10] + pequenos[11]) / 2
+    assert abs(tabela(meio) - meio * 1e6) < 1e-12
+
+
+def test_tabela_grau_par_usa_nos_mais_proximos():
+    uniforme = np.arange(8.0)
+    nao_uniforme = np.array([0.0, 0.7, 1.9, 3.0, 3.4, 5.1, 6.0, 7.2])
+    for x in (uniforme, nao_uniforme):
+        y = np.exp(x / 4)
+        for consulta in np.linspace(x[1], x[-2], 41) + 0.013:  # evita pontos médios exatos
+            # Grau 0: o valor do nó mais próximo
+            assert InterpoladorTabela(x, y, grau=0)(consulta) == y[np.argmin(np.abs(x - consulta))]
+            # Grau 2: a parábola pelos três nós em torno do mais próximo
+            j = int(np.argmin(np.abs(x - consulta)))
+            nos = slice(j - 1, j + 2)
+            esperado = interpolacao_newton(x[nos], y[nos], consulta)
+            assert abs(InterpoladorTabela(x, y, grau=2)(consulta) - esperado) < 1e-12
+
+
+def test_chebyshev_rejeita_numero_de_nos_invalido():
+    with pytest.raises(ValueError, match="pelo menos 1"):
+        InterpoladorChebyshev(np.sin, 0, 1, n=0)
+
+
+@pytest.mark.parametrize("entradas", [
+    ["y*x", "0", "1", "", "0.5"],     # segunda variável: TypeError na avaliação
+    ["exp(x)", "0", "1", "0", "0.5"],  # número de nós inválido
+])
+def test_menu_chebyshev_trata_entradas_invalidas(monkeypatch, capsys, entradas):
+    respostas = iter(entradas)
+    monkeypatch.setattr(builtins, "input", lambda *_: next(respostas))
+    interpolar_funcao_chebyshev()
+    saida = capsys.readouterr().out
+    assert "erro" in saida.lower()
+    assert "Resultado" not in saida